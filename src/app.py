@@ -10,12 +10,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 import pygame
 from pygame.locals import *
-import platform
 import json
 import threading
-import time
 
 from src.hardware.keypad import Keypad
+from src.hardware.platform_info import IS_RPI
 from src.states.splash import SplashState
 from src.states.dashboard import DashboardState
 from src.states.books_menu import BooksMenuState
@@ -41,33 +40,30 @@ def main():
     # Constants
     WIDTH = 1280
     HEIGHT = 720
-
-    # Detect if running on Raspberry Pi
-    is_rpi = 'raspberrypi' in platform.platform().lower()
+    FRAME_TIMEOUT_MS = 16  # Longest the loop sleeps waiting for events (~60 FPS)
 
     # Set display mode: fullscreen on Pi, windowed elsewhere
-    flags = pygame.FULLSCREEN if is_rpi else 0
+    flags = pygame.FULLSCREEN if IS_RPI else 0
     screen = pygame.display.set_mode((WIDTH, HEIGHT), flags)
-    pygame.display.set_caption("MEB-x Kiosk" if not is_rpi else "")
+    pygame.display.set_caption("MEB-x Kiosk" if not IS_RPI else "")
 
     # Load font
     font = pygame.font.Font(os.path.join('assets', 'fonts', 'default.ttf'), 50)
 
     # Initialize keypad
     keypad = Keypad()
+    keypad.start()
 
     # Start content downloader if configured
     downloader = None
+    downloader_thread = None
     if 'content' in config and config['content'].get('enabled', False):
         print("Starting background content downloader...")
         downloader = ContentDownloader(config['content'])
 
-        def run_downloader_periodically():
-            while True:
-                downloader.check_and_download_content()
-                time.sleep(config['content']['check_interval_hours'] * 3600)
-
-        downloader_thread = threading.Thread(target=run_downloader_periodically, daemon=True)
+        interval_seconds = config['content']['check_interval_hours'] * 3600
+        downloader_thread = threading.Thread(target=downloader.run_periodically,
+                                             args=(interval_seconds,), daemon=True)
         downloader_thread.start()
 
     # Initialize states
@@ -89,21 +85,24 @@ def main():
     running = True
 
     while running:
-        dt = clock.tick(60) / 1000.0  # 60 FPS
-
-        # Get all pygame events
+        # Block until an event arrives or the frame timeout passes, so an idle kiosk sleeps
+        first_event = pygame.event.wait(FRAME_TIMEOUT_MS)
         pygame_events = pygame.event.get()
+        if first_event.type != pygame.NOEVENT:
+            pygame_events.insert(0, first_event)
+
+        dt = clock.tick(60) / 1000.0  # Still cap at 60 FPS when events stream in
 
         # Handle pygame events for system (QUIT, etc.)
         for event in pygame_events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                current_state.needs_redraw = True
+                current_state.full_redraw = True
 
-        # Poll keypad for key presses (pass events to keypad)
-        key = keypad.get_key(pygame_events)
-        events = []
-        if key:
-            events.append(('key_press', key))
+        # Translate keypad input already in the event queue into state events
+        events = [('key_press', key) for key in keypad.get_keys(pygame_events)]
 
         # Update current state
         current_state.handle_events(events)
@@ -123,12 +122,23 @@ def main():
             current_state_id = next_state_id
             # Reset transition flag
             current_state.should_transition = False
+            current_state.needs_redraw = True
+            current_state.full_redraw = True
+
+        # Render current state and update display, unless nothing has changed.
+        # States that report the areas they changed only have those pushed out.
+        if current_state.needs_redraw:
+            dirty_rects = current_state.render(screen, font)
+            current_state.full_redraw = False
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
 
-        # Render current state
-        current_state.render(screen, font)
-
-        # Update display
-        pygame.display.flip()
+    # Wake the downloader thread so it can exit and release its connections
+    if downloader_thread:
+        downloader.stop()
+        downloader_thread.join(timeout=5)
 
     pygame.quit()
 
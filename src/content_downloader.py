@@ -6,11 +6,27 @@ Handles automatic downloading of books and videos from configured source.
 
 import json
 import hashlib
+import concurrent.futures
 import os
+import socket
 import threading
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
+from urllib.parse import urlparse
+from src.services.deleted_content_tracker import get_tracker
+from src.services.partial_download import InFlightPaths, download_part
+
+try:
+    import orjson  # Faster JSON parsing for large metadata files
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Read size used when hashing local files, so large videos are never loaded whole
+HASH_CHUNK_SIZE = 1 << 20
 
 
 class ContentDownloader:
@@ -24,29 +40,239 @@ class ContentDownloader:
             config (dict): Content configuration from app_config.json
         """
         self.config = config
+        self.deleted_tracker = get_tracker()
         os.makedirs(os.path.join('content', 'books'), exist_ok=True)
         os.makedirs(os.path.join('content', 'videos'), exist_ok=True)
 
+        # Reuse one pooled session so connections and TLS sessions are kept alive,
+        # with at least one connection per download worker
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(8, self.config.get('download_concurrency', 4)),
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        # Destination paths being downloaded; one writer per '.part' file
+        self._in_flight = InFlightPaths()
+
+        # Validators from the last fully processed content list, for conditional GETs
+        self.cache_file = os.path.join('config', 'content_cache.json')
+        self._index_etag = None
+        self._index_last_modified = None
+        self._load_index_cache()
+
     def _log(self, message):
         """Simple logging to console with timestamp."""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print(f"[{timestamp}] Content Downloader: {message}")
 
+    def _load_index_cache(self):
+        """Load the stored ETag/Last-Modified of the content list."""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+            self._index_etag = cache.get('etag')
+            self._index_last_modified = cache.get('last_modified')
+        except (json.JSONDecodeError, IOError) as e:
+            self._log(f"Error loading content cache: {e}")
+
+    def _save_index_cache(self):
+        """Persist the ETag/Last-Modified of the content list."""
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump({
+                    'etag': self._index_etag,
+                    'last_modified': self._index_last_modified
+                }, f, indent=2)
+        except IOError as e:
+            self._log(f"Error saving content cache: {e}")
+
     def check_connectivity(self):
         """
-        Check for internet connectivity.
+        Check that the content source can be reached.
+
+        Opens (and immediately closes) a TCP connection to the source host,
+        which costs one round-trip and no TLS handshake.
 
         Returns:
             bool: True if connected, False otherwise
         """
+        url = urlparse(self.config['source_url'])
+        port = url.port or (443 if url.scheme == 'https' else 80)
         try:
-            # Test DNS resolution and connectivity to Google DNS
-            response = requests.head('https://dns.google', timeout=10, allow_redirects=True)
-            return response.status_code == 200
-        except Exception as e:
+            socket.create_connection((url.hostname, port), timeout=2).close()
+            return True
+        except OSError as e:
             self._log(f"Connectivity check failed: {e}")
             return False
 
+    def _hash_file(self, path):
+        """
+        Hash a local file in fixed-size chunks.
+
+        Args:
+            path (str): Path to the local file
+
+        Returns:
+            str: Hex MD5 digest, matching the hashes published by the content source
+        """
+        file_hash = hashlib.md5()
+        with open(path, 'rb', buffering=0) as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def _probe_remote(self, url):
+        """
+        Fetch the validators for a remote file with a HEAD request.
+
+        Args:
+            url (str): Remote file URL
+
+        Returns:
+            dict: 'etag' and 'content_length' entries (None when unavailable)
+        """
+        try:
+            response = self._session.head(
+                url,
+                timeout=self.config.get('timeout_seconds', 60),
+                allow_redirects=True
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self._log(f"HEAD request failed for {url}: {e}")
+            return {'etag': None, 'content_length': None}
+
+        content_length = response.headers.get('Content-Length')
+        return {
+            'etag': response.headers.get('ETag'),
+            'content_length': int(content_length) if content_length is not None else None
+        }
+
+    def _matches_remote(self, local_path, entry, remote):
+        """
+        Check whether a local file matches the remote one without hashing it.
+
+        Args:
+            local_path (str): Path to the local file
+            entry (dict): Stored metadata entry for the file
+            remote (dict): Validators returned by _probe_remote
+
+        Returns:
+            bool: True if the stored ETag or file size still matches
+        """
+        local_size = os.stat(local_path).st_size
+        # An unchanged ETag only vouches for the local copy if that is still the
+        # size it was recorded at; a truncated file must fall through to hashing
+        if remote['etag'] and entry.get('etag') == remote['etag']:
+            return local_size == entry.get('size')
+        if remote['content_length'] is not None:
+            return (entry.get('size') == remote['content_length'] and
+                    local_size == remote['content_length'])
+        return False
+
+    def _is_up_to_date(self, local_path, file_info, entry):
+        """
+        Decide whether an existing local file matches the remote item.
+
+        Cheap checks run first: stat() against the content list and the stored
+        metadata, then the remote validators, and only as a last resort a full
+        hash of the file.
+
+        Args:
+            local_path (str): Path to the existing local file
+            file_info (dict): Remote item with name, url, hash and optional size/mtime/etag
+            entry (dict): Stored metadata entry for the file, or None
+
+        Returns:
+            tuple: (up_to_date, entry) where entry is a refreshed metadata entry or None
+        """
+        fhash = file_info['hash']
+        st = os.stat(local_path)
+
+        # A different size or a newer remote copy means the file has to be fetched again
+        if 'size' in file_info and st.st_size != file_info['size']:
+            return False, None
+        if 'mtime' in file_info and file_info['mtime'] > st.st_mtime:
+            return False, None
+
+        if entry and entry.get('hash') == fhash:
+            # Untouched since it was recorded with this hash
+            if entry.get('size') == st.st_size and entry.get('mtime') == st.st_mtime:
+                return True, None
+            # Same ETag as the listed item, and the local copy is still the size recorded for it
+            if (file_info.get('etag') and entry.get('etag') == file_info['etag'] and
+                    entry.get('size') == st.st_size):
+                return True, None
+
+        remote = self._probe_remote(file_info['url'])
+        refreshed = {
+            'hash': fhash,
+            'etag': remote['etag'],
+            'size': st.st_size,
+            'mtime': st.st_mtime
+        }
+        if entry and entry.get('hash') == fhash and self._matches_remote(local_path, entry, remote):
+            return True, refreshed
+        if self._hash_file(local_path) == fhash:
+            return True, refreshed
+        return False, None
+
+    def _sync_file(self, file_info, entry):
+        """
+        Bring one remote item up to date locally.
+
+        Args:
+            file_info (dict): Remote content item
+            entry (dict): Stored metadata entry for the file, or None
+
+        Returns:
+            tuple: (downloaded, entry) where entry is the metadata entry to store, or None
+        """
+        fname = file_info['name']
+        ftype = file_info['type']  # 'book' or 'video'
+        furl = file_info['url']
+        fhash = file_info['hash']
+
+        # Determine local directory
+        local_dir = os.path.join('content', ftype + 's')
+        local_path = os.path.join(local_dir, fname)
+
+        # Check if file already exists and is up-to-date
+        if os.path.exists(local_path):
+            if isinstance(entry, str):
+                # Older metadata only stored the hash
+                entry = {'hash': entry}
+
+            up_to_date, refreshed = self._is_up_to_date(local_path, file_info, entry)
+            if up_to_date:
+                # Remember size/mtime/ETag so the next check can skip probing and hashing
+                return False, refreshed
+
+        # Only one worker may write a given '.part' file
+        if not self._in_flight.claim(local_path):
+            return False, None
+        try:
+            etag = download_part(self._session, furl, local_path,
+                                 self.config.get('timeout_seconds', 60))
+        finally:
+            self._in_flight.release(local_path)
+
+        self._log(f"Downloaded {fname} to {ftype}s")
+        st = os.stat(local_path)
+        return True, {
+            'hash': fhash,
+            'etag': etag,
+            'size': st.st_size,
+            'mtime': st.st_mtime
+        }
+
     def download_content(self):
         """Download new or updated content if configured and online."""
         if not self.config.get('enabled', False):
@@ -62,71 +288,83 @@ class ContentDownloader:
         local_metadata = {}
         if os.path.exists(metadata_file):
             try:
-                with open(metadata_file, 'r') as f:
-                    local_metadata = json.load(f)
+                with open(metadata_file, 'rb') as f:
+                    local_metadata = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
             except Exception as e:
                 self._log(f"Error loading metadata: {e}")
 
         self._log("Checking for content updates...")
 
         try:
-            # Fetch content list from API
-            response = requests.get(
+            # Fetch content list from API, letting the server answer 304 if it is unchanged
+            headers = {}
+            if self._index_etag:
+                headers['If-None-Match'] = self._index_etag
+            if self._index_last_modified:
+                headers['If-Modified-Since'] = self._index_last_modified
+
+            response = self._session.get(
                 self.config['source_url'],
+                headers=headers,
                 timeout=self.config.get('timeout_seconds', 60)
             )
+            if response.status_code == 304:
+                self._log("Content list unchanged, no new content to download")
+                return
             response.raise_for_status()
 
             # Assume the API returns a list of content items
             # Each item should have: name, type ('book' or 'video'), url, hash
+            # and may also carry size (bytes), mtime (epoch seconds) and etag
             remote_files = response.json()
 
             downloaded_count = 0
-
-            for file_info in remote_files:
-                try:
-                    fname = file_info['name']
-                    ftype = file_info['type']  # 'book' or 'video'
-                    furl = file_info['url']
-                    fhash = file_info['hash']
-
-                    # Determine local directory
-                    local_dir = os.path.join('content', ftype + 's')
-                    local_path = os.path.join(local_dir, fname)
-
-                    # Check if file already exists and is up-to-date
-                    needs_download = True
-                    if os.path.exists(local_path):
-                        with open(local_path, 'rb') as f:
-                            existing_hash = hashlib.md5(f.read()).hexdigest()
-                        if existing_hash == fhash:
-                            needs_download = False
-
-                    if needs_download:
-                        # Download the file
-                        file_response = requests.get(
-                            furl,
-                            timeout=self.config.get('timeout_seconds', 60)
-                        )
-                        file_response.raise_for_status()
-
-                        # Save the file
-                        with open(local_path, 'wb') as f:
-                            f.write(file_response.content)
-
-                        # Update metadata
-                        local_metadata[fname] = fhash
+            failed_count = 0
+            metadata_changed = False
+
+            # Items are independent and mostly wait on the network (HEAD probes and
+            # downloads), so a few are handled at once over the shared session
+            max_workers = self.config.get('download_concurrency', 4)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Items the user deleted are skipped before any stat, hash or HEAD request
+                futures = {
+                    executor.submit(self._sync_file, file_info, local_metadata.get(file_info.get('name'))):
+                        file_info.get('name')
+                    for file_info in remote_files
+                    if not self.deleted_tracker.should_skip_download(file_info.get('type'), file_info.get('name'))
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    fname = futures[future]
+                    try:
+                        downloaded, entry = future.result()
+                    except Exception as e:
+                        self._log(f"Error downloading {fname}: {e}")
+                        failed_count += 1
+                        continue
+
+                    if entry:
+                        local_metadata[fname] = entry
+                        metadata_changed = True
+                    if downloaded:
                         downloaded_count += 1
-                        self._log(f"Downloaded {fname} to {ftype}s")
 
-                except Exception as e:
-                    self._log(f"Error downloading {fname}: {e}")
-                    continue
+            if metadata_changed:
+                # Save updated metadata to a temporary file, then swap it in atomically
+                tmp_file = metadata_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    if HAS_ORJSON:
+                        f.write(orjson.dumps(local_metadata))
+                    else:
+                        f.write(json.dumps(local_metadata).encode('utf-8'))
+                os.replace(tmp_file, metadata_file)
+
+            # Only trust a 304 next time if every item in this list was handled
+            if failed_count == 0:
+                self._index_etag = response.headers.get('ETag')
+                self._index_last_modified = response.headers.get('Last-Modified')
+                self._save_index_cache()
 
             if downloaded_count > 0:
-                # Save updated metadata
-                with open(metadata_file, 'w') as f:
-                    json.dump(local_metadata, f, indent=2)
                 self._log(f"Download complete, {downloaded_count} files updated")
             else:
                 self._log("No new content to download")
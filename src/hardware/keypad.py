@@ -4,7 +4,8 @@ MEB-x Keypad Handler
 Provides interface for the 3x4 matrix keypad.
 
 This module supports dual-mode functionality:
-- On Linux (Raspberry Pi): Uses hardware keypad via gpiozero library with GPIO pins.
+- On Linux (Raspberry Pi): Uses hardware keypad via gpiozero library with GPIO pins,
+  detecting presses with edge-triggered row interrupts.
 - On other systems (e.g., Windows for development): Uses a mock keypad via pygame to simulate keyboard input.
   Keyboard mappings for mock keypad:
   Primary (Numpad keys - recommended):
@@ -24,18 +25,29 @@ This module supports dual-mode functionality:
   - Escape → '*' (back)
 """
 
-import platform
+import functools
+import threading
 import time
 
+from src.hardware.platform_info import IS_LINUX
+
 try:
     import pygame
     pygame_available = True
+    # Event posted by the hardware scan thread; USEREVENT + 1 is used by the menu states
+    KEYPAD_EVENT = pygame.USEREVENT + 2
 except ImportError:
     pygame_available = False
+    KEYPAD_EVENT = None
 
-if platform.system() == 'Linux':
+if IS_LINUX:
     from gpiozero import Button, OutputDevice
 
+# Settling time after switching a column while locating the pressed key
+COLUMN_SETTLE_SECONDS = 0.00005
+# Row edges caused by our own column switching are ignored for this long after a scan
+SCAN_DEBOUNCE_SECONDS = 0.05
+
 
 class MockKeypad:
     """
@@ -108,66 +120,148 @@ class MockKeypad:
                     return self.fallback_mappings[event.key]
         return None
 
+    def get_keys(self, pygame_events):
+        """
+        Translate every mapped key press in the given pygame events.
+
+        Args:
+            pygame_events: List of pygame events from the main loop
+
+        Returns:
+            list: Keypad characters in the order they were pressed.
+        """
+        keys = []
+        for event in pygame_events:
+            if event.type == pygame.KEYDOWN:
+                key = self.key_mappings.get(event.key) or self.fallback_mappings.get(event.key)
+                if key:
+                    keys.append(key)
+        return keys
+
 
 class Keypad:
     def __init__(self):
-        if platform.system() == 'Linux':
+        if IS_LINUX:
             # Raspberry Pi with hardware keypad
             self.hardware = True
             self.row_pins = [18, 19, 20]  # GPIO input pins for rows
             self.col_pins = [12, 13, 16, 26]  # GPIO output pins for columns
 
-            # Keypad mapping (3 rows x 4 columns)
-            self.key_map = [
-                ['1', '2', '3', 'A'],
-                ['4', '5', '6', 'B'],
-                ['7', '8', '9', 'C']
-            ]
+            # Keypad mapping (3 rows x 4 columns), flattened and indexed by row * 4 + col
+            self.key_map = (
+                '1', '2', '3', 'A',
+                '4', '5', '6', 'B',
+                '7', '8', '9', 'C'
+            )
+            self.num_cols = len(self.col_pins)
+
+            # The scan thread sleeps on _wake until a row interrupt fires
+            self._wake = threading.Event()
+            self._pending_row = None
+            self._ignore_until = 0.0
+            self._scan_thread = None
 
             # Setup rows as buttons with pull-up
-            self.rows = [Button(pin, pull_up=True) for pin in self.row_pins]
+            self.rows = tuple(Button(pin, pull_up=True) for pin in self.row_pins)
             # Setup columns as outputs
-            self.cols = [OutputDevice(pin) for pin in self.col_pins]
+            self.cols = tuple(OutputDevice(pin) for pin in self.col_pins)
 
-            # Set all columns high initially
+            # Drive all columns low so any key press pulls its row low and fires an edge
             for col in self.cols:
-                col.on()
+                col.off()
+
+            for row_idx, row in enumerate(self.rows):
+                row.when_pressed = functools.partial(self._on_row, row_idx)
         else:
             # Development machine with mock keypad
             self.hardware = False
             self.mock = MockKeypad()
 
-    def get_key(self, pygame_events=None):
+    def start(self):
+        """
+        Start the background scan thread (hardware keypad only).
+
+        Detected keys are posted to the pygame event queue as KEYPAD_EVENT
+        events with a 'key' attribute.
+        """
+        if self.hardware and self._scan_thread is None:
+            self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
+            self._scan_thread.start()
+
+    def _on_row(self, row_idx):
+        """
+        Wake the scan thread after a row interrupt.
+
+        Runs on the gpiozero callback thread.
+
+        Args:
+            row_idx: Index of the row whose pin went low
         """
-        Scan the keypad and return the pressed key character or None.
+        if time.monotonic() < self._ignore_until:
+            return
+        self._pending_row = row_idx
+        self._wake.set()
+
+    def _scan_loop(self):
+        """Wait for row interrupts and post the pressed key to pygame."""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            key = self._scan_row(self._pending_row)
+            if key:
+                pygame.event.post(pygame.event.Event(KEYPAD_EVENT, key=key))
 
-        On Linux: Scans hardware keypad matrix.
-        On other systems: Polls pygame events for keyboard input.
+    def _scan_row(self, row_idx):
+        """
+        Find which column is holding the given row low.
 
         Args:
-            pygame_events: List of pygame events to check (optional, passed from main loop)
+            row_idx: Index of the row that fired
 
         Returns:
-            str or None: The key character pressed or None if no key is pressed.
+            str or None: The key character pressed, or None if it was released already.
+        """
+        # Ignore the row edges our own column switching produces
+        self._ignore_until = float('inf')
+
+        row = self.rows[row_idx]
+        key = None
+
+        # Raise every column, then lower them one at a time to find the one holding the row low
+        for col in self.cols:
+            col.on()
+        for col_idx, col in enumerate(self.cols):
+            col.off()
+            time.sleep(COLUMN_SETTLE_SECONDS)
+            pressed = row.is_pressed
+            col.on()
+            if pressed:
+                key = self.key_map[row_idx * self.num_cols + col_idx]
+                break
+
+        # Back to all columns low, ready for the next press
+        for col in self.cols:
+            col.off()
+        self._ignore_until = time.monotonic() + SCAN_DEBOUNCE_SECONDS
+
+        return key
+
+    def get_keys(self, pygame_events):
+        """
+        Return the keypad characters pressed since the last frame.
+
+        On Linux: Collects the KEYPAD_EVENTs posted by the scan thread.
+        On other systems: Translates keyboard events via the mock keypad.
+
+        Args:
+            pygame_events: List of pygame events from the main loop
+
+        Returns:
+            list: Keypad characters in the order they were pressed.
         """
         if self.hardware:
-            # Hardware keypad scanning logic
-            for col_idx, col in enumerate(self.cols):
-                # Set other columns high
-                for other_col in self.cols:
-                    if other_col != col:
-                        other_col.on()
-                # Set current column low
-                col.off()
-                time.sleep(0.01)  # Small delay for settling
-                # Check each row
-                for row_idx, row in enumerate(self.rows):
-                    if row.is_pressed == False:  # Row is low (pressed)
-                        col.on()  # Restore high
-                        return self.key_map[row_idx][col_idx]
-                # Restore column high
-                col.on()
-            return None
+            return [event.key for event in pygame_events if event.type == KEYPAD_EVENT]
         else:
             # Mock keypad: delegate to MockKeypad
-            return self.mock.get_key(pygame_events)
+            return self.mock.get_keys(pygame_events)
@@ -0,0 +1,13 @@
+"""
+MEB-x Platform Detection
+
+Platform checks computed once at import time and shared by the app and hardware modules.
+"""
+
+import platform
+
+# Linux hosts drive the hardware keypad through GPIO
+IS_LINUX = platform.system() == 'Linux'
+
+# Raspberry Pi runs the kiosk fullscreen
+IS_RPI = 'raspberrypi' in platform.platform().lower()
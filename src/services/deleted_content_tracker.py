@@ -6,8 +6,29 @@ Tracks files that users have deleted to prevent automatic redownload while allow
 
 import os
 import json
+import threading
 from typing import Dict, List, Set
 
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker() -> 'DeletedContentTracker':
+    """
+    Get the process-wide tracker, loading it from disk on first use.
+
+    Sharing one instance keeps the menus, viewer and downloader in sync and
+    avoids re-reading the tracker file on every list refresh.
+
+    Returns:
+        The shared DeletedContentTracker
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = DeletedContentTracker()
+        return _tracker
+
 
 class DeletedContentTracker:
     """Manages tracking of deleted content files."""
@@ -20,7 +41,10 @@ class DeletedContentTracker:
             tracker_file: Path to the JSON file storing deleted content info
         """
         self.tracker_file = tracker_file
-        self.deleted_content: Dict[str, List[str]] = {}  # content_type -> list of filenames
+        self.deleted_content: Dict[str, Set[str]] = {}  # content_type -> set of filenames
+
+        # Guards deleted_content; changes are saved to disk while it is held
+        self._lock = threading.Lock()
 
         # Ensure config directory exists
         os.makedirs(os.path.dirname(tracker_file), exist_ok=True)
@@ -33,21 +57,32 @@ class DeletedContentTracker:
         try:
             if os.path.exists(self.tracker_file):
                 with open(self.tracker_file, 'r', encoding='utf-8') as f:
-                    self.deleted_content = json.load(f)
+                    # Stored as lists for readability, kept as sets for O(1) lookups
+                    self.deleted_content = {k: set(v) for k, v in json.load(f).items()}
             else:
                 # Initialize with empty structure
-                self.deleted_content = {'book': [], 'video': []}
+                self.deleted_content = {'book': set(), 'video': set()}
                 self._save_deleted_content()
         except (json.JSONDecodeError, IOError) as e:
             print(f"Error loading deleted content tracker: {e}")
             # Initialize with empty structure on error
-            self.deleted_content = {'book': [], 'video': []}
+            self.deleted_content = {'book': set(), 'video': set()}
 
     def _save_deleted_content(self):
-        """Save deleted content to the tracker file."""
+        """
+        Save deleted content to the tracker file.
+
+        Written to a temporary file and swapped in atomically, so losing power
+        mid-write never leaves a truncated tracker that forgets every deletion.
+        """
+        tmp_file = self.tracker_file + '.tmp'
         try:
-            with open(self.tracker_file, 'w', encoding='utf-8') as f:
-                json.dump(self.deleted_content, f, indent=2, ensure_ascii=False)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({k: sorted(v) for k, v in self.deleted_content.items()},
+                          f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.tracker_file)
         except IOError as e:
             print(f"Error saving deleted content tracker: {e}")
 
@@ -55,17 +90,20 @@ class DeletedContentTracker:
         """
         Mark a file as deleted.
 
+        Saved immediately: kiosks are usually switched off at the plug, so a
+        deletion held back in memory could be lost and the file come back.
+
         Args:
             content_type: 'book' or 'video'
             filename: Name of the deleted file
         """
-        if content_type not in self.deleted_content:
-            self.deleted_content[content_type] = []
-
-        if filename not in self.deleted_content[content_type]:
-            self.deleted_content[content_type].append(filename)
+        with self._lock:
+            deleted = self.deleted_content.setdefault(content_type, set())
+            if filename in deleted:
+                return
+            deleted.add(filename)
             self._save_deleted_content()
-            print(f"Marked {filename} as deleted")
+        print(f"Marked {filename} as deleted")
 
     def mark_as_restored(self, content_type: str, filename: str):
         """
@@ -75,10 +113,13 @@ class DeletedContentTracker:
             content_type: 'book' or 'video'
             filename: Name of the restored file
         """
-        if content_type in self.deleted_content and filename in self.deleted_content[content_type]:
-            self.deleted_content[content_type].remove(filename)
+        with self._lock:
+            deleted = self.deleted_content.get(content_type)
+            if not deleted or filename not in deleted:
+                return
+            deleted.discard(filename)
             self._save_deleted_content()
-            print(f"Removed {filename} from deleted list")
+        print(f"Removed {filename} from deleted list")
 
     def is_deleted(self, content_type: str, filename: str) -> bool:
         """
@@ -91,8 +132,7 @@ class DeletedContentTracker:
         Returns:
             True if the file is marked as deleted
         """
-        return (content_type in self.deleted_content and
-                filename in self.deleted_content[content_type])
+        return filename in self.deleted_content.get(content_type, ())
 
     def get_deleted_files(self, content_type: str) -> List[str]:
         """
@@ -104,7 +144,8 @@ class DeletedContentTracker:
         Returns:
             List of deleted filenames
         """
-        return self.deleted_content.get(content_type, [])
+        with self._lock:
+            return sorted(self.deleted_content.get(content_type, ()))
 
     def get_all_deleted_files(self) -> Dict[str, List[str]]:
         """
@@ -113,7 +154,8 @@ class DeletedContentTracker:
         Returns:
             Dictionary with content types as keys and lists of filenames as values
         """
-        return self.deleted_content.copy()
+        with self._lock:
+            return {k: sorted(v) for k, v in self.deleted_content.items()}
 
     def should_skip_download(self, content_type: str, filename: str) -> bool:
         """
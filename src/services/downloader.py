@@ -6,10 +6,68 @@ Supports direct downloads and YouTube videos.
 """
 
 import os
+import re
 import json
+import concurrent.futures
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
 import yt_dlp
-from .deleted_content_tracker import DeletedContentTracker
+from .deleted_content_tracker import get_tracker
+from .partial_download import InFlightPaths, download_part
+
+try:
+    import orjson  # Faster JSON parsing for large content lists
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# On-disk copy of the content list, so menus can use it without a network round-trip
+INDEX_CACHE_FILE = os.path.join('content', '.index_cache.json')
+
+# Content lists fetched more recently than this are reused rather than re-requested
+REVALIDATE_MIN_INTERVAL_SECONDS = 30
+
+# yt-dlp options shared by every YouTube download; only 'outtmpl' varies per video
+YTDL_OPTIONS = {
+    'format': 'best[height<=720]',  # Limit to 720p for kiosk
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+    # Fetch several fragments of DASH/HLS streams at once
+    'concurrent_fragment_downloads': 4,
+    # Add options to avoid bot detection
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'http_headers': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-us,en;q=0.5',
+        'Sec-Fetch-Mode': 'navigate',
+        'Referer': 'https://www.youtube.com/',
+    },
+    # Add sleep interval to avoid rate limiting
+    'sleep_interval': 1,
+    'max_sleep_interval': 5,
+    # Additional anti-bot measures
+    'cookiesfrombrowser': None,  # Don't use browser cookies
+    'ignoreerrors': True,
+    'no_check_certificate': False,
+}
+
+# Hosts served by yt-dlp: youtube.com, youtube-nocookie.com, youtu.be and their subdomains
+YOUTUBE_HOST_RE = re.compile(r'(?:^|\.)(?:youtube(?:-nocookie)?\.com|youtu\.be)$', re.IGNORECASE)
+
+# Extensions yt-dlp may give a downloaded video
+YOUTUBE_EXTENSIONS = frozenset(('.mp4', '.webm', '.mkv', '.avi', '.mov'))
+
+# Local directory for each content type
+CONTENT_DIRS = {
+    'book': os.path.join('content', 'books'),
+    'video': os.path.join('content', 'videos'),
+}
 
 
 class ContentDownloader:
@@ -26,43 +84,215 @@ class ContentDownloader:
         """
         self.config = config
         self.progress_callback = progress_callback
-        self.deleted_tracker = DeletedContentTracker()
+        self.deleted_tracker = get_tracker()
+        self._stop_event = threading.Event()
+
+        # Runs menu-triggered work so the UI thread never waits on the network
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='downloader')
+        self._update_future = None  # Menu-triggered update check in progress, if any
+
+        # The periodic check and menu-triggered work run on different threads and can
+        # reach the same missing item at once; only one of them may write its '.part' file
+        self._in_flight = InFlightPaths()
+
+        # The content directories are only ever created here, not per item
+        for local_dir in CONTENT_DIRS.values():
+            os.makedirs(local_dir, exist_ok=True)
+
+        # Reuse one pooled session so connections and TLS sessions are kept alive.
+        # The periodic and menu-triggered checks can each run a full set of
+        # download workers, so keep enough idle connections for both.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(8, 2 * self.config.get('download_concurrency', 4)),
+            max_retries=Retry(total=3, backoff_factor=0.5,
+                              status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        # Cached content list and its validators; served stale while revalidating
+        self._catalog = None
+        self._catalog_etag = None
+        self._catalog_last_modified = None
+        self._catalog_fetched_at = None
+        self._catalog_lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._revalidating = False
+        self._checked_catalog = None  # Content list whose items check_for_updates has all fetched
+        self._load_catalog_cache()
+
+    def _load_catalog_cache(self):
+        """Load the content list cached by a previous run, if any."""
+        if not os.path.exists(INDEX_CACHE_FILE):
+            return
+        try:
+            with open(INDEX_CACHE_FILE, 'rb') as f:
+                cache = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
+            self._catalog = cache['items']
+            self._catalog_etag = cache.get('etag')
+            self._catalog_last_modified = cache.get('last_modified')
+        except (json.JSONDecodeError, KeyError, IOError) as e:
+            print(f"Error loading content list cache: {e}")
+
+    def _save_catalog_cache(self):
+        """Write the content list cache atomically."""
+        os.makedirs(os.path.dirname(INDEX_CACHE_FILE), exist_ok=True)
+        tmp_file = INDEX_CACHE_FILE + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'etag': self._catalog_etag,
+                    'last_modified': self._catalog_last_modified,
+                    'items': self._catalog
+                }, f, ensure_ascii=False)
+            os.replace(tmp_file, INDEX_CACHE_FILE)
+        except IOError as e:
+            print(f"Error saving content list cache: {e}")
+
+    def _revalidate(self, timeout=10, max_age=0):
+        """
+        Fetch the content list with a conditional GET and update the cache.
+
+        Only one request is in flight at a time; a caller that waited for
+        another caller's request reuses its result when it is recent enough.
+
+        Args:
+            timeout (float): Request timeout in seconds
+            max_age (float): Reuse a list fetched less than this many seconds ago
+
+        Returns:
+            list: Current content items
+        """
+        with self._fetch_lock:
+            if (self._catalog is not None and self._catalog_fetched_at is not None
+                    and time.monotonic() - self._catalog_fetched_at < max_age):
+                return self._catalog
+
+            headers = {}
+            if self._catalog is not None:
+                if self._catalog_etag:
+                    headers['If-None-Match'] = self._catalog_etag
+                if self._catalog_last_modified:
+                    headers['If-Modified-Since'] = self._catalog_last_modified
+
+            response = self._session.get(self.config['source_url'], headers=headers, timeout=timeout)
+            if response.status_code == 304:
+                self._catalog_fetched_at = time.monotonic()
+                return self._catalog
+            response.raise_for_status()
+
+            items = orjson.loads(response.content) if HAS_ORJSON else response.json()
+            with self._catalog_lock:
+                self._catalog = items
+                self._catalog_etag = response.headers.get('ETag')
+                self._catalog_last_modified = response.headers.get('Last-Modified')
+                self._catalog_fetched_at = time.monotonic()
+                self._save_catalog_cache()
+            return items
+
+    def _revalidate_in_background(self):
+        """Refresh the content list on a worker thread, once at a time."""
+        with self._catalog_lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+
+        def revalidate():
+            try:
+                self._revalidate()
+            except Exception as e:
+                print(f"Background content list refresh failed: {e}")
+            finally:
+                self._revalidating = False
+
+        threading.Thread(target=revalidate, daemon=True).start()
+
+    def get_catalog(self):
+        """
+        Get the content list, preferring the cached copy.
+
+        A cached list older than 'catalog_max_age_seconds' (default 300) is still
+        returned immediately, while a background request revalidates it. The
+        network is only waited on when nothing has been cached yet.
+
+        Returns:
+            list: Content items
+        """
+        if self._catalog is None:
+            return self._revalidate()
+
+        max_age = self.config.get('catalog_max_age_seconds', 300)
+        if self._catalog_fetched_at is None or time.monotonic() - self._catalog_fetched_at > max_age:
+            self._revalidate_in_background()
+        return self._catalog
+
+    def run_periodically(self, interval_seconds):
+        """
+        Check for content on a fixed schedule until stop() is called.
+
+        Checks are scheduled on the monotonic clock, so a long download does not
+        shift the following checks.
+
+        Args:
+            interval_seconds (float): Time between the start of consecutive checks
+        """
+        next_check = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.check_and_download_content()
+                finally:
+                    next_check += interval_seconds
+                self._stop_event.wait(max(0, next_check - time.monotonic()))
+        finally:
+            self._session.close()
+
+    def stop(self):
+        """Ask run_periodically() to exit, waking it if it is waiting."""
+        self._stop_event.set()
+        self._pool.shutdown(wait=False)
+
+    def submit_update_check(self):
+        """
+        Run check_for_updates() on a background thread.
+
+        Progress callbacks are invoked on that thread, not the UI thread. While a
+        check is still running, the same future is returned rather than starting
+        a second check that would download the same items again.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the number of items downloaded
+        """
+        with self._catalog_lock:
+            if self._update_future is None or self._update_future.done():
+                self._update_future = self._pool.submit(self.check_for_updates)
+            return self._update_future
+
+    def submit_redownload(self, content_type: str, filename: str, progress_callback=None):
+        """
+        Run redownload_deleted_content() on a background thread.
+
+        Progress callbacks are invoked on that thread, not the UI thread.
+
+        Returns:
+            concurrent.futures.Future: Resolves to True if the redownload succeeded
+        """
+        return self._pool.submit(self.redownload_deleted_content, content_type, filename, progress_callback)
 
     def _is_youtube_url(self, url):
         """Check if URL is from YouTube or YouTube-like platforms."""
-        youtube_domains = [
-            'youtube.com', 'youtu.be', 'youtube-nocookie.com',
-            'm.youtube.com', 'music.youtube.com'
-        ]
-        return any(domain in url.lower() for domain in youtube_domains)
+        try:
+            host = urlparse(url).hostname
+        except ValueError:
+            return False
+        return host is not None and YOUTUBE_HOST_RE.search(host) is not None
 
     def _download_youtube_video(self, url, output_path):
         """Download YouTube video using yt-dlp."""
         try:
-            ydl_opts = {
-                'outtmpl': output_path,
-                'format': 'best[height<=720]',  # Limit to 720p for kiosk
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-                # Add options to avoid bot detection
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-us,en;q=0.5',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Referer': 'https://www.youtube.com/',
-                },
-                # Add sleep interval to avoid rate limiting
-                'sleep_interval': 1,
-                'max_sleep_interval': 5,
-                # Additional anti-bot measures
-                'cookiesfrombrowser': None,  # Don't use browser cookies
-                'ignoreerrors': True,
-                'no_check_certificate': False,
-            }
-
+            ydl_opts = dict(YTDL_OPTIONS, outtmpl=output_path)
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             return True
@@ -70,105 +300,178 @@ class ContentDownloader:
             print(f"YouTube download error: {e}")
             return False
 
+    def _stream_to_file(self, url, local_path, name, progress_callback=None):
+        """
+        Stream a URL to local_path via a '.part' file.
+
+        The file only appears at local_path once it is complete and synced, so
+        an interrupted download never leaves a truncated file behind. If the
+        connection drops, the '.part' file is kept and the next attempt resumes
+        it with a Range request guarded by If-Range. If another task is already
+        downloading the same file, this waits for it instead of writing the
+        '.part' file too.
+
+        Args:
+            url (str): URL to download
+            local_path (str): Destination path for the file
+            name (str): Name reported to the progress callback
+            progress_callback (callable): Optional callback(name, progress_float)
+
+        Raises:
+            requests.RequestException: If the download fails
+            OSError: If the file cannot be written
+        """
+        if self._in_flight.claim(local_path):
+            try:
+                download_part(self._session, url, local_path, 10, name, progress_callback)
+            finally:
+                self._in_flight.release(local_path)
+
+        # Final progress update
+        if progress_callback:
+            progress_callback(name, 1.0)
+
+    def _download_one(self, item, local_path, is_youtube):
+        """
+        Download a single content item to its local path.
+
+        Args:
+            item (dict): Content item from the remote list
+            local_path (str): Destination path for the file; for YouTube videos,
+                              the path without extension
+            is_youtube (bool): Whether to download with yt-dlp
+
+        Returns:
+            tuple: (name, success) for the downloaded item
+        """
+        name = item.get('name')
+        url = item.get('url')
+
+        print(f"Downloading new content item: '{name}'...")
+        success = False
+
+        if is_youtube:
+            # Use yt-dlp for YouTube videos; it adds the extension itself
+            print(f"Detected YouTube URL, using yt-dlp for '{name}'...")
+            success = self._download_youtube_video(url, local_path)
+        else:
+            # Use regular HTTP download for other URLs
+            try:
+                self._stream_to_file(url, local_path, name, self.progress_callback)
+                success = True
+            except (requests.RequestException, OSError) as e:
+                print(f"Error downloading '{name}': {e}")
+                success = False
+
+        return name, success
+
+    def _scan_existing(self):
+        """
+        List the files already in each content directory.
+
+        One directory scan per type replaces a stat call per item (and one per
+        YouTube extension).
+
+        Returns:
+            dict: Content type -> (set of filenames, set of base names of video files)
+        """
+        splitext = os.path.splitext
+        existing = {}
+        for item_type, local_dir in CONTENT_DIRS.items():
+            try:
+                with os.scandir(local_dir) as entries:
+                    names = {entry.name for entry in entries if entry.is_file()}
+            except FileNotFoundError:
+                names = set()
+            # yt-dlp picks the extension, so YouTube items are matched by base name
+            video_bases = set()
+            for filename in names:
+                base_name, ext = splitext(filename)
+                if ext in YOUTUBE_EXTENSIONS:
+                    video_bases.add(base_name)
+            existing[item_type] = (names, video_bases)
+        return existing
+
+    def _resolve_item(self, existing, local_dir, name, url):
+        """
+        Work out where an item goes and whether it is already there.
+
+        Args:
+            existing (tuple): (filenames, video base names) for the item's content directory
+            local_dir (str): Content directory for the item's type
+            name (str): Item filename from the content list
+            url (str): Item URL
+
+        Returns:
+            tuple: (local_path, is_youtube, file_exists). For YouTube videos the
+                   path has no extension, and any known video extension counts.
+        """
+        names, video_bases = existing
+        if self._is_youtube_url(url):
+            base_name = os.path.splitext(name)[0]
+            return os.path.join(local_dir, base_name), True, base_name in video_bases
+        return os.path.join(local_dir, name), False, name in names
+
+    def _download_all(self, to_download):
+        """
+        Download several items concurrently.
+
+        Downloads are I/O-bound, so a few run at once over the shared session;
+        the 'download_concurrency' cap (default 4) keeps the SD card from thrashing.
+
+        Args:
+            to_download (list): (item, local_path, is_youtube) tuples
+
+        Yields:
+            tuple: (name, success) for each item as it finishes
+        """
+        if not to_download:
+            return
+        max_workers = self.config.get('download_concurrency', 4)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._download_one, *entry) for entry in to_download]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+
     def check_and_download_content(self):
         """Fetch content list and download new items."""
         try:
-            # Fetch data from source URL
-            response = requests.get(self.config['source_url'], timeout=10)
-            response.raise_for_status()
+            # Periodic checks revalidate the content list with the server, unless a
+            # menu check has just done so
+            content_items = self._revalidate(max_age=REVALIDATE_MIN_INTERVAL_SECONDS)
+            existing = self._scan_existing()
 
-            # Parse JSON array
-            content_items = response.json()
-
-            # Process each item
+            # Collect the items that actually need downloading
+            to_download = []
             for item in content_items:
                 name = item.get('name')
                 item_type = item.get('type')
                 url = item.get('url')
 
-                # Determine local directory and content type for tracker
-                if item_type == 'book':
-                    local_dir = 'content/books/'
-                    tracker_type = 'book'
-                elif item_type == 'video':
-                    local_dir = 'content/videos/'
-                    tracker_type = 'video'
-                else:
+                # Determine local directory
+                local_dir = CONTENT_DIRS.get(item_type)
+                if local_dir is None:
                     print(f"Warning: Unknown content type '{item_type}' for item '{name}'. Skipping.")
                     continue
 
                 # Check if this file was previously deleted by user
-                if self.deleted_tracker.should_skip_download(tracker_type, name):
+                if self.deleted_tracker.should_skip_download(item_type, name):
                     print(f"Content item '{name}' was previously deleted by user. Skipping download.")
                     continue
 
-                # Ensure directory exists
-                os.makedirs(local_dir, exist_ok=True)
-
-                # Construct full local path
-                local_path = os.path.join(local_dir, name)
-
-                # Check if file already exists (handle YouTube extensions)
-                file_exists = False
-                if self._is_youtube_url(url):
-                    # For YouTube, check if any file with the base name exists
-                    base_name = os.path.splitext(name)[0]
-                    for ext in ['.mp4', '.webm', '.mkv', '.avi', '.mov']:
-                        if os.path.exists(os.path.join(local_dir, base_name + ext)):
-                            file_exists = True
-                            break
-                else:
-                    file_exists = os.path.exists(local_path)
+                # Construct full local path and check if the file already exists
+                local_path, is_youtube, file_exists = self._resolve_item(
+                    existing[item_type], local_dir, name, url)
 
                 if file_exists:
                     print(f"Content item '{name}' already exists. Skipping download.")
                     continue
 
-                # Download the file
-                print(f"Downloading new content item: '{name}'...")
-                success = False
-
-                if self._is_youtube_url(url):
-                    # Use yt-dlp for YouTube videos
-                    print(f"Detected YouTube URL, using yt-dlp for '{name}'...")
-                    # yt-dlp will automatically add extension, so we need to handle the filename
-                    base_path = os.path.splitext(local_path)[0]  # Remove extension if present
-                    success = self._download_youtube_video(url, base_path)
-                else:
-                    # Use regular HTTP download for other URLs
-                    try:
-                        file_response = requests.get(url, timeout=10, stream=True)
-                        file_response.raise_for_status()
-
-                        # Get total file size for progress calculation
-                        total_size = int(file_response.headers.get('content-length', 0))
-                        downloaded_size = 0
-
-                        # Stream download to file with progress updates
-                        with open(local_path, 'wb') as f:
-                            for chunk in file_response.iter_content(chunk_size=8192):
-                                if chunk:
-                                    f.write(chunk)
-                                    downloaded_size += len(chunk)
-
-                                    # Report progress if callback is available
-                                    if self.progress_callback and total_size > 0:
-                                        progress = downloaded_size / total_size
-                                        self.progress_callback(name, min(progress, 1.0))
-
-                        success = True
-
-                        # Final progress update
-                        if self.progress_callback:
-                            self.progress_callback(name, 1.0)
-
-                    except requests.RequestException as e:
-                        print(f"Error downloading '{name}': {e}")
-                        success = False
+                to_download.append((item, local_path, is_youtube))
 
+            for name, success in self._download_all(to_download):
                 if not success:
                     print(f"Failed to download '{name}', skipping...")
-                    continue
 
             print("Content check finished.")
 
@@ -180,15 +483,25 @@ class ContentDownloader:
             print(f"Unexpected error in content downloader: {e}")
 
     def check_for_updates(self):
-        """Quick check for content updates without full logging."""
+        """
+        Quick check for content updates without full logging.
+
+        Returns:
+            int: Number of items downloaded, so callers can skip refreshing when nothing changed
+        """
+        downloaded = 0
         try:
-            # Fetch data from source URL
-            response = requests.get(self.config['source_url'], timeout=5)
-            response.raise_for_status()
+            # Use the cached content list; it is refreshed in the background when stale
+            content_items = self.get_catalog()
 
-            # Parse JSON array
-            content_items = response.json()
-            new_items_found = 0
+            # An unchanged list (a 304 keeps the same object) cannot hold new items
+            # once a previous check has fetched everything in it
+            if content_items is self._checked_catalog:
+                print("Menu check: No new content available")
+                return downloaded
+
+            existing = self._scan_existing()
+            to_download = []
 
             # Process each item
             for item in content_items:
@@ -197,59 +510,29 @@ class ContentDownloader:
                 url = item.get('url')
 
                 # Determine local directory
-                if item_type == 'book':
-                    local_dir = 'content/books/'
-                elif item_type == 'video':
-                    local_dir = 'content/videos/'
-                else:
+                local_dir = CONTENT_DIRS.get(item_type)
+                if local_dir is None:
                     continue
 
-                # Ensure directory exists
-                os.makedirs(local_dir, exist_ok=True)
-
-                # Construct full local path
-                local_path = os.path.join(local_dir, name)
-
-                # Check if file already exists (handle YouTube extensions)
-                file_exists = False
-                if self._is_youtube_url(url):
-                    # For YouTube, check if any file with the base name exists
-                    base_name = os.path.splitext(name)[0]
-                    for ext in ['.mp4', '.webm', '.mkv', '.avi', '.mov']:
-                        if os.path.exists(os.path.join(local_dir, base_name + ext)):
-                            file_exists = True
-                            break
-                else:
-                    file_exists = os.path.exists(local_path)
+                # Construct full local path and check if the file already exists
+                local_path, is_youtube, file_exists = self._resolve_item(
+                    existing[item_type], local_dir, name, url)
 
                 if not file_exists:
-                    new_items_found += 1
-                    # Download immediately
-                    print(f"Menu-triggered download: '{name}'...")
-                    success = False
-
-                    if self._is_youtube_url(url):
-                        print(f"Detected YouTube URL, using yt-dlp for '{name}'...")
-                        base_path = os.path.splitext(local_path)[0]
-                        success = self._download_youtube_video(url, base_path)
-                    else:
-                        try:
-                            file_response = requests.get(url, timeout=10, stream=True)
-                            file_response.raise_for_status()
-
-                            with open(local_path, 'wb') as f:
-                                for chunk in file_response.iter_content(chunk_size=8192):
-                                    f.write(chunk)
-                            success = True
-
-                        except requests.RequestException as e:
-                            print(f"Error downloading '{name}': {e}")
-                            success = False
-
-                    if success:
-                        print(f"Successfully downloaded '{name}'")
-                    else:
-                        print(f"Failed to download '{name}'")
+                    to_download.append((item, local_path, is_youtube))
+
+            # Download everything that is missing at once rather than one by one
+            new_items_found = len(to_download)
+            all_succeeded = True
+            for name, success in self._download_all(to_download):
+                if success:
+                    downloaded += 1
+                    print(f"Successfully downloaded '{name}'")
+                else:
+                    print(f"Failed to download '{name}'")
+                    all_succeeded = False
+            if all_succeeded:
+                self._checked_catalog = content_items
 
             if new_items_found == 0:
                 print("Menu check: No new content available")
@@ -258,6 +541,7 @@ class ContentDownloader:
 
         except Exception as e:
             print(f"Menu update check failed: {e}")
+        return downloaded
 
     def redownload_deleted_content(self, content_type: str, filename: str, progress_callback=None) -> bool:
         """
@@ -272,11 +556,8 @@ class ContentDownloader:
             True if redownload was successful
         """
         try:
-            # Fetch current content list to find the file
-            response = requests.get(self.config['source_url'], timeout=10)
-            response.raise_for_status()
-
-            content_items = response.json()
+            # Look the file up in the (cached) content list
+            content_items = self.get_catalog()
 
             # Find the matching item
             target_item = None
@@ -290,51 +571,25 @@ class ContentDownloader:
                 return False
 
             # Determine local directory
-            if content_type == 'book':
-                local_dir = 'content/books/'
-            elif content_type == 'video':
-                local_dir = 'content/videos/'
-            else:
+            local_dir = CONTENT_DIRS.get(content_type)
+            if local_dir is None:
                 print(f"Unknown content type: {content_type}")
                 return False
 
-            # Ensure directory exists
-            os.makedirs(local_dir, exist_ok=True)
-
             url = target_item.get('url')
-            local_path = os.path.join(local_dir, filename)
+            local_path, is_youtube, _ = self._resolve_item((set(), set()), local_dir, filename, url)
 
             print(f"Redownloading '{filename}'...")
             success = False
 
-            if self._is_youtube_url(url):
+            if is_youtube:
                 print(f"Detected YouTube URL, using yt-dlp for '{filename}'...")
-                base_path = os.path.splitext(local_path)[0]
-                success = self._download_youtube_video(url, base_path)
+                success = self._download_youtube_video(url, local_path)
             else:
                 try:
-                    file_response = requests.get(url, timeout=10, stream=True)
-                    file_response.raise_for_status()
-
-                    total_size = int(file_response.headers.get('content-length', 0))
-                    downloaded_size = 0
-
-                    with open(local_path, 'wb') as f:
-                        for chunk in file_response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                downloaded_size += len(chunk)
-
-                                if progress_callback and total_size > 0:
-                                    progress = downloaded_size / total_size
-                                    progress_callback(filename, min(progress, 1.0))
-
+                    self._stream_to_file(url, local_path, filename, progress_callback)
                     success = True
-
-                    if progress_callback:
-                        progress_callback(filename, 1.0)
-
-                except requests.RequestException as e:
+                except (requests.RequestException, OSError) as e:
                     print(f"Error redownloading '{filename}': {e}")
                     success = False
 
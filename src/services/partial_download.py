@@ -0,0 +1,186 @@
+"""
+MEB-x Partial Download Helpers
+
+Streams files to disk through a resumable '.part' file, shared by both content downloaders.
+"""
+
+import os
+import shutil
+import threading
+import time
+import requests
+import urllib3
+
+# Read and write downloads in 1 MiB blocks; small writes are slow on SD cards
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Minimum time between progress callbacks, so fast links don't flood the UI thread
+PROGRESS_INTERVAL_SECONDS = 0.2
+# Appended to a '.part' file's name for the file holding the validator it was started from
+PART_VALIDATOR_SUFFIX = '.validator'
+
+
+def _range_validator(headers):
+    """
+    Pick the response validator to resume a download with via If-Range.
+
+    If-Range only accepts a strong ETag, so a weak one falls back to Last-Modified.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        str: The validator, or None if the response has neither
+    """
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+class InFlightPaths:
+    """Destination paths being downloaded, so each '.part' file has a single writer."""
+
+    def __init__(self):
+        self._events = {}  # Destination path -> Event set when its download ends
+        self._lock = threading.Lock()
+
+    def claim(self, local_path):
+        """
+        Take ownership of downloading local_path, waiting while another thread holds it.
+
+        Args:
+            local_path (str): Destination path for the file
+
+        Returns:
+            bool: True if the caller now owns the path and must release it,
+                  False if another thread finished downloading it meanwhile
+        """
+        while True:
+            with self._lock:
+                done = self._events.get(local_path)
+                if done is None:
+                    self._events[local_path] = threading.Event()
+                    return True
+            done.wait()
+            if os.path.exists(local_path):
+                return False
+
+    def release(self, local_path):
+        """Give up ownership of local_path and wake any thread waiting for it."""
+        with self._lock:
+            self._events.pop(local_path).set()
+
+
+def download_part(session, url, local_path, timeout, name=None, progress_callback=None):
+    """
+    Download (or resume) local_path's '.part' file, sync it and move it into place.
+
+    The file only appears at local_path once it is complete and synced, so an
+    interrupted download never leaves a truncated file behind. If the connection
+    drops, the '.part' file is kept and the next attempt resumes it with a Range
+    request. The validator of the response it was started from is kept beside it
+    and sent as If-Range, so a file that changed on the server is fetched whole
+    rather than appended to the old copy's bytes; without one it starts over.
+
+    Callers must hold local_path in an InFlightPaths while this runs.
+
+    Args:
+        session (requests.Session): Session to download with
+        url (str): URL to download
+        local_path (str): Destination path for the file
+        timeout (float): Request timeout in seconds
+        name (str): Name reported to the progress callback
+        progress_callback (callable): Optional callback(name, progress_float)
+
+    Returns:
+        str: The ETag of the response, or None
+
+    Raises:
+        requests.RequestException: If the download fails
+        OSError: If the file cannot be written
+    """
+    part_path = local_path + '.part'
+    validator_path = part_path + PART_VALIDATOR_SUFFIX
+    start = 0
+    headers = {}
+    try:
+        with open(validator_path, 'r') as f:
+            validator = f.read()
+        start = os.path.getsize(part_path)
+    except OSError:
+        pass
+    if start:
+        headers = {'Range': f'bytes={start}-', 'If-Range': validator}
+
+    try:
+        with session.get(url, headers=headers, timeout=timeout, stream=True) as file_response:
+            stale = file_response.status_code == 416
+            if not stale:
+                file_response.raise_for_status()
+                etag = file_response.headers.get('ETag')
+                _write_part(file_response, part_path, validator_path, start, name, progress_callback)
+
+        if stale:
+            # The partial file is no longer valid for this resource; start over
+            os.unlink(part_path)
+            os.unlink(validator_path)
+            return download_part(session, url, local_path, timeout, name, progress_callback)
+
+        os.replace(part_path, local_path)
+        if os.path.exists(validator_path):
+            os.unlink(validator_path)
+    except requests.RequestException:
+        # Keep what was received so the next attempt can resume it
+        raise
+    except BaseException:
+        for path in (part_path, validator_path):
+            if os.path.exists(path):
+                os.unlink(path)
+        raise
+    return etag
+
+
+def _write_part(file_response, part_path, validator_path, start, name, progress_callback):
+    """Stream a response into the '.part' file and fsync it; see download_part."""
+    # A plain 200 means the server ignored the Range header or the file
+    # changed since the '.part' file was started, so rewrite from scratch
+    resumed = bool(start) and file_response.status_code == 206
+    if not resumed:
+        start = 0
+        # Drop the old validator before truncating, so it never describes new bytes
+        if os.path.exists(validator_path):
+            os.unlink(validator_path)
+
+    # Get total file size for progress calculation
+    total_size = start + int(file_response.headers.get('content-length', 0))
+    downloaded_size = start
+
+    with open(part_path, 'ab' if resumed else 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+        if not resumed:
+            validator = _range_validator(file_response.headers)
+            if validator:
+                with open(validator_path, 'w') as vf:
+                    vf.write(validator)
+
+        if progress_callback is None:
+            # Nobody is watching, so copy straight from the raw stream without
+            # building a chunk iterator
+            file_response.raw.decode_content = True
+            try:
+                shutil.copyfileobj(file_response.raw, f, DOWNLOAD_CHUNK_SIZE)
+            except urllib3.exceptions.HTTPError as e:
+                raise requests.ConnectionError(e)
+        else:
+            next_report = 0.0
+            for chunk in file_response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    downloaded_size += len(chunk)
+
+                    # Report progress, at most every PROGRESS_INTERVAL_SECONDS
+                    now = time.monotonic()
+                    if total_size > 0 and now >= next_report:
+                        next_report = now + PROGRESS_INTERVAL_SECONDS
+                        progress_callback(name, min(downloaded_size / total_size, 1.0))
+        f.flush()
+        os.fsync(f.fileno())
@@ -13,6 +13,13 @@ class BaseState(ABC):
     def __init__(self):
         self.should_transition = False
         self.next_state = None
+        # The main loop only renders and flips while this is set. States whose
+        # screen only changes on input clear it in render() and set it again when
+        # something changes; states that never clear it are drawn every frame.
+        self.needs_redraw = True
+        # Set by the main loop when the screen no longer shows this state's last
+        # frame (after a transition or expose), so render() must draw everything
+        self.full_redraw = True
 
     @abstractmethod
     def update(self, dt: float):
@@ -42,5 +49,9 @@ class BaseState(ABC):
         Args:
             screen: Pygame screen surface to draw on.
             font: Pygame font object for text rendering.
+
+        Returns:
+            list: Rects of the screen that changed, or None if the whole screen
+            should be updated.
         """
         pass
@@ -4,249 +4,12 @@ MEB-x Books Menu State
 Displays a scrollable list of available books with proper UI components.
 """
 
-import os
-import pygame
-from src.states.base_state import BaseState
-from src.states.viewer import ViewerState
-from src.ui.renderer import UIRenderer
-from src.ui.components import Text, ListItem, Scrollbar, DownloadProgress
-from src.services.deleted_content_tracker import DeletedContentTracker
+from src.states.content_menu import ContentMenuState
 
 
-class BooksMenuState(BaseState):
+class BooksMenuState(ContentMenuState):
     """State for browsing and selecting books."""
 
-    def __init__(self, downloader=None):
-        super().__init__()
-        self.renderer = UIRenderer()
-        self.renderer.load_fonts(os.path.join('assets', 'fonts', 'default.ttf'))
-
-        self.downloader = downloader
-        self.selected_index = 0
-        self.scroll_offset = 0
-        self.content_check_started = False
-
-        # Navigation key mappings
-        self.NAV_UP = '8'
-        self.NAV_DOWN = '2'
-        self.NAV_SELECT = '5'
-        self.NAV_BACK = '*'
-
-        # UI layout constants
-        self.item_height = 60
-        self.visible_items = 8
-        self.list_padding = self.renderer.get_spacing('lg')
-
-        self.load_books()  # Load existing books without downloading
-        self._init_ui()
-
-    def _init_ui(self):
-        """Initialize UI components."""
-        screen_width, screen_height = 1280, 720
-
-        # Title
-        self.title = Text(self.renderer, 0, self.renderer.get_spacing('xl'),
-                         "Available Books", '3xl', 'text_primary', 'center')
-        self.title.rect.centerx = screen_width // 2
-
-        # List container dimensions
-        list_width = 800
-        list_height = self.visible_items * self.item_height
-        list_x = (screen_width - list_width) // 2
-        list_y = self.title.rect.bottom + self.renderer.get_spacing('lg')
-
-        self.list_x = list_x
-        self.list_y = list_y
-        self.list_width = list_width
-        self.list_height = list_height
-
-        # Scrollbar
-        scrollbar_width = 12
-        scrollbar_x = list_x + list_width + self.renderer.get_spacing('md')
-        scrollbar_y = list_y
-        scrollbar_height = list_height
-
-        self.scrollbar = Scrollbar(self.renderer, scrollbar_x, scrollbar_y, scrollbar_width, scrollbar_height,
-                                  len(self.books), self.visible_items, self.scroll_offset)
-
-        # Instructions
-        self.instructions = Text(self.renderer, 0, screen_height - self.renderer.get_spacing('xl'),
-                                "↑↓ Navigate • 5 Select • * Back", 'sm', 'text_muted', 'center')
-        self.instructions.rect.centerx = screen_width // 2
-
-        # Status message for empty list
-        self.status_message = Text(self.renderer, 0, 0, "", 'lg', 'text_secondary', 'center')
-        self.status_message.rect.center = (screen_width // 2, screen_height // 2)
-
-        # Download progress indicator
-        progress_width = 400
-        progress_height = 60
-        progress_x = (screen_width - progress_width) // 2
-        progress_y = screen_height - self.renderer.get_spacing('3xl') - progress_height
-
-        self.download_progress = DownloadProgress(self.renderer, progress_x, progress_y,
-                                                progress_width, progress_height)
-        self.download_progress.visible = False  # Hidden by default
-
-        # Set up progress callback if downloader exists
-        if self.downloader:
-            self.downloader.progress_callback = self._on_download_progress
-
-    def _on_download_progress(self, filename: str, progress: float):
-        """Handle download progress updates."""
-        self.download_progress.update_progress(filename, progress)
-        self.download_progress.visible = True
-
-        # Hide progress when download completes
-        if progress >= 1.0:
-            # Keep it visible for a moment, then hide
-            pygame.time.set_timer(pygame.USEREVENT + 1, 2000)  # Hide after 2 seconds
-
-    def load_books(self):
-        """Scan the books directory for available files and include deleted books for redownload."""
-        try:
-            books_dir = os.path.join('content', 'books')
-            if not os.path.exists(books_dir):
-                os.makedirs(books_dir)
-
-            # Get all files, filter for common book formats
-            all_files = os.listdir(books_dir)
-            book_extensions = ['.txt', '.pdf', '.epub', '.docx']
-            available_books = [
-                f for f in all_files
-                if any(f.lower().endswith(ext) for ext in book_extensions)
-            ]
-
-            # Get deleted books that can be redownloaded
-            tracker = DeletedContentTracker()
-            deleted_books = tracker.get_deleted_files('book')
-
-            # Combine available and deleted books
-            # Available books come first, then deleted books with [DELETED] prefix
-            self.books = available_books.copy()
-            self.deleted_books = []  # Track which books are deleted for redownload
-
-            for deleted_book in deleted_books:
-                if deleted_book not in available_books:  # Don't show if already available
-                    self.books.append(f"[DELETED] {deleted_book}")
-                    self.deleted_books.append(deleted_book)
-
-            # Sort alphabetically
-            self.books.sort()
-        except Exception as e:
-            print(f"Error loading books: {e}")
-            self.books = []
-            self.deleted_books = []
-
-    def check_for_content_updates(self):
-        """Check for content updates asynchronously."""
-        if self.downloader and not self.content_check_started:
-            self.content_check_started = True
-            import threading
-            def update_check():
-                print("Books menu: Checking for content updates...")
-                self.downloader.check_for_updates()
-                # Refresh the book list after updates
-                self.load_books()
-                # Update scrollbar with new item count
-                if hasattr(self, 'scrollbar'):
-                    self.scrollbar.update_scroll(self.scroll_offset, len(self.books), self.visible_items)
-
-            thread = threading.Thread(target=update_check, daemon=True)
-            thread.start()
-
-    def update_scroll(self):
-        """Update scroll position based on selected index."""
-        if self.selected_index < self.scroll_offset:
-            self.scroll_offset = self.selected_index
-        elif self.selected_index >= self.scroll_offset + self.visible_items:
-            self.scroll_offset = self.selected_index - self.visible_items + 1
-
-        self.scrollbar.update_scroll(self.scroll_offset, len(self.books), self.visible_items)
-
-    def update(self, dt: float):
-        # Start content update check on first update (after UI is initialized)
-        if not self.content_check_started:
-            self.check_for_content_updates()
-
-    def handle_events(self, events: list):
-        for event_type, key in events:
-            if event_type == 'key_press':
-                if key == self.NAV_UP and self.selected_index > 0:
-                    self.selected_index -= 1
-                    self.update_scroll()
-                elif key == self.NAV_DOWN and self.selected_index < len(self.books) - 1:
-                    self.selected_index += 1
-                    self.update_scroll()
-                elif key == self.NAV_SELECT and self.books:
-                    selected_book = self.books[self.selected_index]
-
-                    # Check if this is a deleted book that needs redownloading
-                    if selected_book.startswith("[DELETED] "):
-                        actual_filename = selected_book[10:]  # Remove "[DELETED] " prefix
-                        if self.downloader:
-                            print(f"Redownloading deleted book: {actual_filename}")
-                            success = self.downloader.redownload_deleted_content('book', actual_filename, self._on_download_progress)
-                            if success:
-                                # Refresh the book list to show the redownloaded book
-                                self.load_books()
-                                # Update scrollbar
-                                if hasattr(self, 'scrollbar'):
-                                    self.scrollbar.update_scroll(self.scroll_offset, len(self.books), self.visible_items)
-                                print(f"Successfully redownloaded: {actual_filename}")
-                            else:
-                                print(f"Failed to redownload: {actual_filename}")
-                        else:
-                            print("No downloader available for redownload")
-                    else:
-                        # Normal book selection
-                        book_path = os.path.join('content', 'books', selected_book)
-                        ViewerState.set_pending_content('book', book_path, selected_book)
-                        self.should_transition = True
-                        self.next_state = 'VIEWER'
-                elif key == self.NAV_BACK:
-                    self.should_transition = True
-                    self.next_state = 'DASHBOARD'
-
-    def render(self, screen, ui_font):
-        # Clear screen with background
-        screen.fill(self.renderer.get_color('background'))
-
-        # Render title
-        self.title.render(screen)
-
-        if not self.books:
-            # Show status message
-            self.status_message.set_text("No books available")
-            self.status_message.render(screen)
-
-            # Show downloading status
-            downloading_msg = Text(self.renderer, 0, self.status_message.rect.bottom + self.renderer.get_spacing('md'),
-                                  "Content downloading in background...", 'base', 'text_muted', 'center')
-            downloading_msg.rect.centerx = 1280 // 2
-            downloading_msg.render(screen)
-            return
-
-        # Render visible list items
-        start_idx = self.scroll_offset
-        end_idx = min(start_idx + self.visible_items, len(self.books))
-
-        for i in range(start_idx, end_idx):
-            item_idx = i - start_idx
-            item_y = self.list_y + (item_idx * self.item_height)
-
-            # Create list item component
-            is_selected = (i == self.selected_index)
-            item = ListItem(self.renderer, self.list_x, item_y, self.list_width, self.item_height,
-                           self.books[i][:50] + '...' if len(self.books[i]) > 50 else self.books[i],
-                           is_selected)
-            item.render(screen)
-
-        # Render scrollbar
-        self.scrollbar.render(screen)
-
-        # Render instructions
-        self.instructions.render(screen)
-
-        # Render download progress if active
-        self.download_progress.render(screen)
+    content_type = 'book'
+    content_name = 'books'
+    extensions = ('.txt', '.pdf', '.epub', '.docx')
@@ -0,0 +1,385 @@
+"""
+MEB-x Content Menu State
+
+Scrollable list of downloaded content, shared by the books and videos menus.
+"""
+
+import os
+import threading
+import pygame
+from src.states.base_state import BaseState
+from src.states.viewer import ViewerState
+from src.ui.renderer import UIRenderer
+from src.ui.components import Text, ListItem, Scrollbar, DownloadProgress
+from src.services.deleted_content_tracker import get_tracker
+
+
+class ContentMenuState(BaseState):
+    """
+    State for browsing and selecting one type of content.
+
+    Subclasses set the content type, the plural name used for the content
+    directory and labels, and the file extensions to list.
+    """
+
+    content_type = None  # 'book' or 'video', as used by the downloader and tracker
+    content_name = None  # Plural name, e.g. 'books'; also the directory under content/
+    extensions = ()  # File extensions listed in the menu, as a tuple for a single str.endswith call
+
+    def __init__(self, downloader=None):
+        super().__init__()
+        self.renderer = UIRenderer.get_default()
+
+        self.downloader = downloader
+        self.selected_index = 0
+        self.scroll_offset = 0
+        self.content_check_started = False
+        self._update_future = None  # Background content update check
+        self._redownload_future = None  # Background redownload of a deleted item
+        self._redownload_filename = None
+
+        # Navigation key mappings
+        self.NAV_UP = '8'
+        self.NAV_DOWN = '2'
+        self.NAV_SELECT = '5'
+        self.NAV_BACK = '*'
+        self._key_handlers = {
+            self.NAV_UP: self._on_up,
+            self.NAV_DOWN: self._on_down,
+            self.NAV_SELECT: self._on_select,
+            self.NAV_BACK: self._on_back,
+        }
+
+        # UI layout constants
+        self.item_height = 60
+        self.visible_items = 8
+        self.list_padding = self.renderer.get_spacing('lg')
+
+        # The item list is filled in by a background scan; see load_items()
+        self.items = []
+        self.is_deleted = []  # Parallel to self.items: True for deleted items offered for redownload
+        self.display_names = []
+        self.loading = True
+        self._scan_result = None
+        # Only one scan runs at a time, so an older scan can never finish after a
+        # newer one; a request made while one runs is served by one more scan after it
+        self._scan_lock = threading.Lock()
+        self._scan_running = False
+        self._rescan_pending = False
+
+        self._init_ui()
+        self.load_items()  # Load existing items without downloading
+
+    def _init_ui(self):
+        """Initialize UI components."""
+        screen_width, screen_height = 1280, 720
+
+        # Looked up once; render() fills with it every frame
+        self.bg_color = self.renderer.get_color('background')
+
+        # Title
+        self.title = Text(self.renderer, 0, self.renderer.get_spacing('xl'),
+                         f"Available {self.content_name.capitalize()}", '3xl', 'text_primary', 'center')
+        self.title.rect.centerx = screen_width // 2
+
+        # List container dimensions
+        list_width = 800
+        list_height = self.visible_items * self.item_height
+        list_x = (screen_width - list_width) // 2
+        list_y = self.title.rect.bottom + self.renderer.get_spacing('lg')
+
+        self.list_x = list_x
+        self.list_y = list_y
+        self.list_width = list_width
+        self.list_height = list_height
+
+        # One list item per visible row, reused as the list scrolls
+        self.list_items = [
+            ListItem(self.renderer, list_x, list_y + i * self.item_height, list_width, self.item_height, "")
+            for i in range(self.visible_items)
+        ]
+
+        # Scrollbar
+        scrollbar_width = 12
+        scrollbar_x = list_x + list_width + self.renderer.get_spacing('md')
+        scrollbar_y = list_y
+        scrollbar_height = list_height
+
+        self.scrollbar = Scrollbar(self.renderer, scrollbar_x, scrollbar_y, scrollbar_width, scrollbar_height,
+                                  len(self.items), self.visible_items, self.scroll_offset)
+
+        # Instructions
+        self.instructions = Text(self.renderer, 0, screen_height - self.renderer.get_spacing('xl'),
+                                "↑↓ Navigate • 5 Select • * Back", 'sm', 'text_muted', 'center')
+        self.instructions.rect.centerx = screen_width // 2
+
+        # Status messages for empty list
+        self.status_message = Text(self.renderer, 0, 0, f"No {self.content_name} available", 'lg', 'text_secondary', 'center')
+        self.status_message.rect.center = (screen_width // 2, screen_height // 2)
+        self.downloading_message = Text(self.renderer, 0,
+                                       self.status_message.rect.bottom + self.renderer.get_spacing('md'),
+                                       "Content downloading in background...", 'base', 'text_muted', 'center')
+        self.downloading_message.rect.centerx = screen_width // 2
+        self._empty_state_surface, self._empty_state_pos = self._compose_texts(
+            self.status_message, self.downloading_message)
+        self.loading_message = Text(self.renderer, 0, 0, f"Loading {self.content_name}...", 'lg', 'text_secondary', 'center')
+        self.loading_message.rect.center = (screen_width // 2, screen_height // 2)
+
+        # Download progress indicator
+        progress_width = 400
+        progress_height = 60
+        progress_x = (screen_width - progress_width) // 2
+        progress_y = screen_height - self.renderer.get_spacing('3xl') - progress_height
+
+        self.download_progress = DownloadProgress(self.renderer, progress_x, progress_y,
+                                                progress_width, progress_height)
+        self.download_progress.visible = False  # Hidden by default
+
+        # Set up progress callback if downloader exists
+        if self.downloader:
+            self.downloader.progress_callback = self._on_download_progress
+
+    def _compose_texts(self, *texts):
+        """
+        Draw several static Text components onto one surface.
+
+        Args:
+            *texts: Center-aligned Text components, drawn where they would render on screen
+
+        Returns:
+            tuple: (surface, topleft) to blit in place of the individual texts
+        """
+        rects = [
+            self.renderer.render_text(text.text, text.font_size, text.color)
+            .get_rect(center=(text.rect.x, text.rect.centery))
+            for text in texts
+        ]
+        bounds = rects[0].unionall(rects[1:])
+        surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for text, rect in zip(texts, rects):
+            text_surface = self.renderer.render_text(text.text, text.font_size, text.color)
+            surface.blit(text_surface, (rect.x - bounds.x, rect.y - bounds.y))
+        return surface.convert_alpha(), bounds.topleft
+
+    def _on_download_progress(self, filename: str, progress: float):
+        """Handle download progress updates."""
+        self.download_progress.update_progress(filename, progress)
+        self.download_progress.visible = True
+        self.needs_redraw = True
+
+        # Hide progress when download completes
+        if progress >= 1.0:
+            # Keep it visible for a moment, then hide
+            pygame.time.set_timer(pygame.USEREVENT + 1, 2000)  # Hide after 2 seconds
+
+    def load_items(self):
+        """
+        Rescan the content directory without blocking the UI thread.
+
+        The scan runs on a background thread; update() swaps in the new list
+        once it is ready. If a scan is already running, another one is run
+        after it, so the list shown always reflects the latest request.
+        """
+        with self._scan_lock:
+            if self._scan_running:
+                self._rescan_pending = True
+                return
+            self._scan_running = True
+        threading.Thread(target=self._scan_worker, daemon=True).start()
+
+    def _scan_worker(self):
+        """Run scans until no further rescan has been requested."""
+        while True:
+            self._scan_items()
+            with self._scan_lock:
+                if not self._rescan_pending:
+                    self._scan_running = False
+                    return
+                self._rescan_pending = False
+
+    def _scan_items(self):
+        """Scan the content directory for available files and include deleted items for redownload."""
+        try:
+            content_dir = os.path.join('content', self.content_name)
+
+            # Get all files, filter for the listed formats. One directory read;
+            # is_file() uses the entry type from the listing, so no stat per file.
+            try:
+                with os.scandir(content_dir) as entries:
+                    available_items = [
+                        entry.name for entry in entries
+                        if entry.name.lower().endswith(self.extensions) and entry.is_file()
+                    ]
+            except FileNotFoundError:
+                os.makedirs(content_dir, exist_ok=True)
+                available_items = []
+
+            # Get deleted items that can be redownloaded
+            tracker = get_tracker()
+            deleted_items = tracker.get_deleted_files(self.content_type)
+
+            # Combine available and deleted items as (label, filename, deleted) rows;
+            # deleted items are listed with a [DELETED] prefix for redownload
+            rows = [(item, item, False) for item in available_items]
+            available_set = set(available_items)
+            for deleted_item in deleted_items:
+                if deleted_item not in available_set:  # Don't show if already available
+                    rows.append((f"[DELETED] {deleted_item}", deleted_item, True))
+
+            # Sort alphabetically by label, ignoring case
+            rows.sort(key=lambda row: row[0].lower())
+        except Exception as e:
+            print(f"Error loading {self.content_name}: {e}")
+            rows = []
+
+        items = [filename for _, filename, _ in rows]
+        is_deleted = [deleted for _, _, deleted in rows]
+        # Truncate long labels once rather than on every frame
+        display_names = [
+            label[:50] + '...' if len(label) > 50 else label
+            for label, _, _ in rows
+        ]
+
+        # Hand the result to the UI thread in one assignment
+        self._scan_result = (items, is_deleted, display_names)
+
+    def check_for_content_updates(self):
+        """Check for content updates asynchronously."""
+        if self.downloader and not self.content_check_started:
+            self.content_check_started = True
+            print(f"{self.content_name.capitalize()} menu: Checking for content updates...")
+            self._update_future = self.downloader.submit_update_check()
+
+    def update_scroll(self):
+        """Update scroll position based on selected index."""
+        if self.selected_index < self.scroll_offset:
+            self.scroll_offset = self.selected_index
+        elif self.selected_index >= self.scroll_offset + self.visible_items:
+            self.scroll_offset = self.selected_index - self.visible_items + 1
+
+        self.scrollbar.update_scroll(self.scroll_offset, len(self.items), self.visible_items)
+
+    def update(self, dt: float):
+        # Swap in the result of a finished background scan
+        scan_result = self._scan_result
+        if scan_result is not None:
+            self._scan_result = None
+            self.items, self.is_deleted, self.display_names = scan_result
+            self.loading = False
+            self.needs_redraw = True
+            self.selected_index = min(self.selected_index, max(len(self.items) - 1, 0))
+            self.update_scroll()
+
+        # Start content update check on first update (after UI is initialized)
+        if not self.content_check_started:
+            self.check_for_content_updates()
+
+        # Refresh the item list once the background update check has finished,
+        # unless it found nothing new
+        if self._update_future is not None and self._update_future.done():
+            downloaded = self._update_future.result()
+            self._update_future = None
+            if downloaded:
+                self.load_items()
+
+        # Show the redownloaded item once its background download has finished
+        if self._redownload_future is not None and self._redownload_future.done():
+            success = self._redownload_future.result()
+            self._redownload_future = None
+            self.needs_redraw = True
+            if success:
+                self.load_items()
+                print(f"Successfully redownloaded: {self._redownload_filename}")
+            else:
+                print(f"Failed to redownload: {self._redownload_filename}")
+
+    def handle_events(self, events: list):
+        if events:
+            self.needs_redraw = True
+        for event_type, key in events:
+            if event_type == 'key_press':
+                handler = self._key_handlers.get(key)
+                if handler is not None:
+                    handler()
+
+    def _on_up(self):
+        """Move the selection up one item."""
+        if self.selected_index > 0:
+            self.selected_index -= 1
+            self.update_scroll()
+
+    def _on_down(self):
+        """Move the selection down one item."""
+        if self.selected_index < len(self.items) - 1:
+            self.selected_index += 1
+            self.update_scroll()
+
+    def _on_select(self):
+        """Open the selected item, or redownload it if it was deleted."""
+        if not self.items:
+            return
+        selected_item = self.items[self.selected_index]
+
+        # Check if this is a deleted item that needs redownloading
+        if self.is_deleted[self.selected_index]:
+            actual_filename = selected_item
+            if self.downloader:
+                # Download in the background; update() refreshes the list when done
+                if self._redownload_future is None:
+                    print(f"Redownloading deleted {self.content_type}: {actual_filename}")
+                    self._redownload_filename = actual_filename
+                    self._redownload_future = self.downloader.submit_redownload(
+                        self.content_type, actual_filename, self._on_download_progress)
+            else:
+                print("No downloader available for redownload")
+        else:
+            # Normal item selection
+            item_path = os.path.join('content', self.content_name, selected_item)
+            ViewerState.set_pending_content(self.content_type, item_path, selected_item)
+            self.should_transition = True
+            self.next_state = 'VIEWER'
+
+    def _on_back(self):
+        """Return to the dashboard."""
+        self.should_transition = True
+        self.next_state = 'DASHBOARD'
+
+    def render(self, screen, ui_font):
+        # Cleared before drawing, so a change made by a download thread meanwhile
+        # still triggers another frame
+        self.needs_redraw = False
+
+        # Clear screen with background
+        screen.fill(self.bg_color)
+
+        # Render title
+        self.title.render(screen)
+
+        if not self.items:
+            if self.loading:
+                self.loading_message.render(screen)
+            else:
+                # Show status message and downloading status, pre-composed in _init_ui
+                screen.blit(self._empty_state_surface, self._empty_state_pos)
+            return
+
+        # Render visible list items
+        start_idx = self.scroll_offset
+        display_names = self.display_names
+
+        for item_idx, item in enumerate(self.list_items):
+            i = start_idx + item_idx
+            if i >= len(display_names):
+                break
+            item.set_text(display_names[i])
+            item.set_selected(i == self.selected_index)
+            item.render(screen)
+
+        # Render scrollbar
+        self.scrollbar.render(screen)
+
+        # Render instructions
+        self.instructions.render(screen)
+
+        # Render download progress if active
+        self.download_progress.render(screen)
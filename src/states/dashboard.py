@@ -5,7 +5,6 @@ Displays the main dashboard with Books and Videos cards.
 """
 
 import pygame
-import os
 from src.states.base_state import BaseState
 from src.ui.renderer import UIRenderer
 from src.ui.components import Card, Text
@@ -16,11 +15,18 @@ class DashboardState(BaseState):
 
     def __init__(self):
         super().__init__()
-        self.renderer = UIRenderer()
-        self.renderer.load_fonts(os.path.join('assets', 'fonts', 'default.ttf'))
+        self.renderer = UIRenderer.get_default()
 
         # Focus state (0 = Books, 1 = Videos)
         self.focused_index = 0
+        self._drawn_focus = None  # Focus shown on screen by the last render
+
+        # Key handlers: 1/2 focus Books/Videos, 5 confirms
+        self._key_handlers = {
+            '1': self._focus_books,
+            '2': self._focus_videos,
+            '5': self._on_select,
+        }
 
         # Initialize UI components
         self._init_ui()
@@ -68,41 +74,58 @@ class DashboardState(BaseState):
                                 "Use 1/2 to select • Press 5 to confirm", 'sm', 'text_muted', 'center')
         self.instructions.rect.centerx = screen_width // 2
 
+        # Everything except the focus border is static, so draw it once
+        self.static_layer = self.renderer.create_layer((screen_width, screen_height))
+        for component in (self.title, self.books_card, self.videos_card, self.books_title,
+                          self.books_subtitle, self.videos_title, self.videos_subtitle,
+                          self.instructions):
+            component.render(self.static_layer)
+
     def update(self, dt: float):
         pass  # No animation or timers needed
 
     def handle_events(self, events: list):
+        if events:
+            self.needs_redraw = True
         for event_type, key in events:
             if event_type == 'key_press':
-                if key == '1':
-                    self.focused_index = 0  # Focus Books
-                elif key == '2':
-                    self.focused_index = 1  # Focus Videos
-                elif key == '5':  # Select/Confirm
-                    if self.focused_index == 0:
-                        self.should_transition = True
-                        self.next_state = 'BOOKS_MENU'
-                    elif self.focused_index == 1:
-                        self.should_transition = True
-                        self.next_state = 'VIDEOS_MENU'
+                handler = self._key_handlers.get(key)
+                if handler is not None:
+                    handler()
+
+    def _focus_books(self):
+        self.focused_index = 0
+
+    def _focus_videos(self):
+        self.focused_index = 1
+
+    def _on_select(self):
+        """Open the menu for the focused card."""
+        self.should_transition = True
+        self.next_state = 'BOOKS_MENU' if self.focused_index == 0 else 'VIDEOS_MENU'
 
     def render(self, screen, font):
-        # Clear screen with background
-        screen.fill(self.renderer.get_color('background'))
-
-        # Update card borders based on focus
-        books_border = 'border_focus' if self.focused_index == 0 else 'border'
-        videos_border = 'border_focus' if self.focused_index == 1 else 'border'
-
-        self.books_card.border_color = books_border
-        self.videos_card.border_color = videos_border
-
-        # Render components
-        self.title.render(screen)
-        self.books_card.render(screen)
-        self.videos_card.render(screen)
-        self.books_title.render(screen)
-        self.books_subtitle.render(screen)
-        self.videos_title.render(screen)
-        self.videos_subtitle.render(screen)
-        self.instructions.render(screen)
+        # Only key presses change the dashboard, so skip frames until the next one
+        self.needs_redraw = False
+
+        if not self.full_redraw:
+            # Only the focus can have changed: swap the two card borders
+            if self.focused_index == self._drawn_focus:
+                return []
+            dirty_rects = [
+                self.renderer.draw_border(screen, card.rect, 'border_focus' if focused else card.border_color,
+                                          border_radius=card.border_radius)
+                for card, focused in ((self.books_card, self.focused_index == 0),
+                                      (self.videos_card, self.focused_index == 1))
+            ]
+            self._drawn_focus = self.focused_index
+            return dirty_rects
+
+        # Background, cards and labels, drawn once in _init_ui
+        screen.blit(self.static_layer, (0, 0))
+
+        # Highlight the focused card's border over its regular one
+        focused_card = self.books_card if self.focused_index == 0 else self.videos_card
+        self.renderer.draw_border(screen, focused_card.rect, 'border_focus',
+                                  border_radius=focused_card.border_radius)
+        self._drawn_focus = self.focused_index
@@ -8,6 +8,7 @@ import pygame
 import os
 from src.states.base_state import BaseState
 from src.ui.renderer import UIRenderer
+from src.ui.image_cache import load_image
 
 
 class SplashState(BaseState):
@@ -16,20 +17,22 @@ class SplashState(BaseState):
     def __init__(self):
         super().__init__()
         self.timer = 3.0  # 3 seconds
-        self.renderer = UIRenderer()
-        self.renderer.load_fonts(os.path.join('assets', 'fonts', 'default.ttf'))
+        self.renderer = UIRenderer.get_default()
 
         # Load logo
         try:
-            self.logo = pygame.image.load('assets/images/eu_logo.png')
+            # Loaded and scaled once per process, already in the display's pixel format.
             # Scale logo to appropriate size (300x300 for better proportion)
-            self.logo = pygame.transform.smoothscale(self.logo, (300, 300))
+            self.logo = load_image(os.path.join('assets', 'images', 'eu_logo.png'), scale=(300, 300))
         except Exception as e:
             print(f"Error loading logo: {e}")
             # Create fallback logo
-            self.logo = pygame.Surface((300, 300))
+            self.logo = pygame.Surface((300, 300)).convert()
             self.logo.fill(self.renderer.get_color('primary'))
 
+        # Title never changes, so rasterize it once
+        self.title_surface = self.renderer.render_text("MEB-x Educational Kiosk", 'lg', 'text_secondary')
+
     def update(self, dt: float):
         self.timer -= dt
         if self.timer <= 0:
@@ -41,6 +44,9 @@ class SplashState(BaseState):
         pass
 
     def render(self, screen, font):
+        # The splash never changes while it is shown, so draw it only once
+        self.needs_redraw = False
+
         # Clear screen with styled background
         screen.fill(self.renderer.get_color('background'))
 
@@ -52,7 +58,5 @@ class SplashState(BaseState):
         screen.blit(self.logo, (logo_x, logo_y))
 
         # Optional: Add app title below logo
-        title_text = "MEB-x Educational Kiosk"
         title_y = logo_y + self.logo.get_height() + self.renderer.get_spacing('lg')
-        self.renderer.draw_text(screen, title_text, (screen_width // 2, title_y),
-                               'lg', 'text_secondary', 'center')
+        self.renderer.blit_text(screen, self.title_surface, (screen_width // 2, title_y), 'center')
@@ -4,21 +4,51 @@ MEB-x Content Viewer State
 Displays books (PDF/text) and plays videos using external players.
 """
 
+import gc
 import os
+import re
+import mmap
+import itertools
+import shutil
+import signal
 import subprocess
 import threading
+import time
+import concurrent.futures
+from collections import OrderedDict
 import pygame
 from src.states.base_state import BaseState
 from src.ui.renderer import UIRenderer
 from src.ui.components import Text
-from src.services.deleted_content_tracker import DeletedContentTracker
+from src.services.deleted_content_tracker import get_tracker
 
-try:
-    import fitz  # PyMuPDF
-    HAS_FITZ = True
-except ImportError:
-    HAS_FITZ = False
-    print("Warning: PyMuPDF not available. PDF viewing will be limited.")
+# PyMuPDF is imported when the first PDF is opened, so starting the kiosk and
+# playing videos don't pay for loading it
+fitz = None
+HAS_FITZ = None  # Unknown until _load_fitz() has run
+
+
+def _load_fitz() -> bool:
+    """Import PyMuPDF on first use and report whether it is available."""
+    global fitz, HAS_FITZ
+    if HAS_FITZ is None:
+        try:
+            import fitz as pymupdf
+            fitz = pymupdf
+            HAS_FITZ = True
+        except ImportError:
+            HAS_FITZ = False
+            print("Warning: PyMuPDF not available. PDF viewing will be limited.")
+    return HAS_FITZ
+
+# Rendered PDF pages kept per document; least recently viewed are dropped first
+PDF_PAGE_CACHE_SIZE = 8
+
+# Rendered book text lines kept per viewer; least recently drawn are dropped first
+LINE_SURFACE_CACHE_SIZE = 200
+
+# Pages rendered between asking MuPDF to empty its internal store
+STORE_SHRINK_INTERVAL = 20
 
 
 class ViewerState(BaseState):
@@ -29,6 +59,9 @@ class ViewerState(BaseState):
     _pending_content_path = None
     _pending_content_name = None
 
+    # Names of installed video players, in order of preference; found on first use
+    _available_player_names = None
+
     @classmethod
     def set_pending_content(cls, content_type, content_path, content_name):
         """Set content to be viewed when state is activated."""
@@ -39,8 +72,7 @@ class ViewerState(BaseState):
     def __init__(self):
         """Initialize viewer state."""
         super().__init__()
-        self.renderer = UIRenderer()
-        self.renderer.load_fonts(os.path.join('assets', 'fonts', 'default.ttf'))
+        self.renderer = UIRenderer.get_default()
 
         # Get pending content
         self.content_type = self._pending_content_type
@@ -66,9 +98,20 @@ class ViewerState(BaseState):
         self.scroll_offset = 0
         self.lines_per_page = 25
         self.pdf_document = None
-        self.text_content = []
-        self.text_lines = []
-        self.pdf_page_images = {}  # Cache for rendered PDF pages
+        self.text_map = None  # Memory-mapped text file
+        self.page_starts = []  # Byte offset where each page of text_map begins
+        self._wrapped_key = None  # (page, width) that _wrapped_lines was wrapped for
+        self._wrapped_lines = []
+        self._line_surfaces = OrderedDict()  # Line text -> rendered surface, LRU
+        self._text_page_key = None  # (page, scroll, width, height) _text_page_surface shows
+        self._text_page_surface = None
+        self.pdf_page_images = OrderedDict()  # LRU cache of rendered PDF pages: (surface, converted)
+        self._page_cache_lock = threading.Lock()  # Guards pdf_page_images
+        self._pdf_lock = threading.Lock()  # Serializes use of pdf_document
+        self._renders_since_shrink = 0
+        # Renders the pages next to the current one while it is being read; only
+        # created once a PDF is open, so videos and text books don't start a thread
+        self._prefetch_pool = None
 
         # Video playing state
         self.video_process = None
@@ -86,11 +129,20 @@ class ViewerState(BaseState):
         """Initialize UI components."""
         screen_width, screen_height = 1280, 720
 
+        # Light grey background (2% grey shade); book text is rendered onto it directly
+        self.bg_color = (230, 230, 230)
+
         # Title
         self.title = Text(self.renderer, 0, self.renderer.get_spacing('xl'),
                          f"Viewing: {self.content_name or 'Unknown'}", '2xl', 'text_primary', 'center')
         self.title.rect.centerx = screen_width // 2
 
+        # Area books are drawn in, between the title and the page info
+        content_x = self.renderer.get_spacing('xl')
+        content_y = self.title.rect.bottom + self.renderer.get_spacing('lg')
+        self.content_rect = pygame.Rect(content_x, content_y, screen_width - 2 * content_x,
+                                        screen_height - content_y - self.renderer.get_spacing('3xl'))
+
         # Loading message
         self.loading_text = Text(self.renderer, 0, 0, "Loading content...", 'lg', 'text_secondary', 'center')
         self.loading_text.rect.center = (screen_width // 2, screen_height // 2)
@@ -104,6 +156,11 @@ class ViewerState(BaseState):
                                      "4/6 Prev/Next Page • 8/2 Scroll • # Delete • * Exit", 'sm', 'text_muted', 'center')
         self.book_instructions.rect.centerx = screen_width // 2
 
+        # Page info, updated when the page changes
+        self.page_info_text = Text(self.renderer, 0, screen_height - self.renderer.get_spacing('2xl'),
+                                   "", 'sm', 'text_muted', 'center')
+        self._page_info_page = None  # Page the page info text was last set for
+
         # Video instructions
         self.video_instructions = Text(self.renderer, 0, screen_height - self.renderer.get_spacing('xl'),
                                       "Video playing... Press # to delete • * to exit", 'sm', 'text_muted', 'center')
@@ -131,17 +188,32 @@ class ViewerState(BaseState):
 
         file_ext = os.path.splitext(self.content_path)[1].lower()
 
-        if file_ext == '.pdf' and HAS_FITZ:
+        if file_ext == '.pdf' and _load_fitz():
             # Load PDF
             self.pdf_document = fitz.open(self.content_path)
+            self._prefetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-prefetch')
             self.total_pages = len(self.pdf_document)
             self.current_page = 0
+            # Render the first page before queuing its neighbours, so opening the
+            # book never waits behind a prefetch holding the document lock
+            self._get_pdf_page_image(self.current_page)
+            self._prefetch_adjacent_pages()
         elif file_ext == '.txt':
-            # Load text file
-            with open(self.content_path, 'r', encoding='utf-8', errors='ignore') as f:
-                self.text_content = f.read()
-            self.text_lines = self.text_content.split('\n')
-            self.total_pages = max(1, len(self.text_lines) // self.lines_per_page + 1)
+            # Map the text file rather than reading it into memory; only the page
+            # offsets are kept, and each page is decoded when it is shown
+            with open(self.content_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    self.text_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self.text_map = b''  # Empty files can't be mapped
+            # A page starts after every lines_per_page-th newline. One linear scan for
+            # newlines; islice keeps every page's last one without a Python-level count.
+            self.page_starts = [0]
+            self.page_starts.extend(match.end() for match in itertools.islice(
+                re.finditer(rb'\n', self.text_map), self.lines_per_page - 1, None, self.lines_per_page))
+            last_page_lines = self.text_map[self.page_starts[-1]:].count(b'\n') + 1
+            total_lines = (len(self.page_starts) - 1) * self.lines_per_page + last_page_lines
+            self.total_pages = max(1, total_lines // self.lines_per_page + 1)
             self.current_page = 0
         else:
             self.error_message = f"Unsupported file format: {file_ext}"
@@ -164,10 +236,12 @@ class ViewerState(BaseState):
                 for player_cmd in available_players:
                     try:
                         print(f"Trying to play video with: {' '.join(player_cmd)}")
+                        # Own process group, so stopping the player also stops its children
                         self.video_process = subprocess.Popen(
                             player_cmd,
                             stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL
+                            stderr=subprocess.DEVNULL,
+                            start_new_session=True
                         )
                         # Don't wait here - let it play in background
                         # We'll check if it's still running in update()
@@ -190,79 +264,187 @@ class ViewerState(BaseState):
 
     def _check_available_players(self):
         """Check which video players are available on the system."""
-        players = [
-            ['mpv', '--fullscreen', '--no-osc', self.content_path],
-            ['omxplayer', '-o', 'hdmi', self.content_path],
-            ['vlc', '--fullscreen', '--no-osd', self.content_path],
-            ['mplayer', '-fs', self.content_path]
-        ]
-
-        available = []
-        for player_cmd in players:
+        players = {
+            'mpv': ['mpv', '--fullscreen', '--no-osc', self.content_path],
+            'omxplayer': ['omxplayer', '-o', 'hdmi', self.content_path],
+            'vlc': ['vlc', '--fullscreen', '--no-osd', self.content_path],
+            'mplayer': ['mplayer', '-fs', self.content_path],
+        }
+
+        # Installed players don't change while the kiosk runs, so look them up on
+        # PATH once instead of starting each one with --help on every video
+        if ViewerState._available_player_names is None:
+            ViewerState._available_player_names = [name for name in players if shutil.which(name)]
+            for name in ViewerState._available_player_names:
+                print(f"Found video player: {name}")
+
+        return [players[name] for name in ViewerState._available_player_names]
+
+    @staticmethod
+    def _signal_video_process(process, force: bool = False):
+        """
+        Stop a video player and any processes it started.
+
+        Args:
+            process: The player's Popen object
+            force: Kill instead of asking the player to terminate
+        """
+        if hasattr(os, 'killpg'):
+            try:
+                os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+                return
+            except ProcessLookupError:
+                return  # Already gone
+            except OSError:
+                pass  # Fall back to signalling just the player
+        if force:
+            process.kill()
+        else:
+            process.terminate()
+
+    def _stop_video_process(self):
+        """
+        Ask the video player to exit without blocking the UI thread.
+
+        This state is dropped as soon as it transitions away, so a daemon thread
+        reaps the player and kills it if it hasn't exited within 2 seconds.
+        """
+        process = self.video_process
+        try:
+            self._signal_video_process(process)
+        except OSError as e:
+            print(f"Error stopping video player: {e}")
+            return
+
+        def reap():
             try:
-                # Check if the player executable exists
-                subprocess.run([player_cmd[0], '--help'],
-                             stdout=subprocess.DEVNULL,
-                             stderr=subprocess.DEVNULL,
-                             timeout=5)
-                available.append(player_cmd)
-                print(f"Found video player: {player_cmd[0]}")
-            except (FileNotFoundError, subprocess.TimeoutExpired, subprocess.SubprocessError):
-                continue
-
-        return available
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                try:
+                    self._signal_video_process(process, force=True)
+                    process.wait()
+                except OSError:
+                    pass
+
+        threading.Thread(target=reap, daemon=True).start()
 
     def _get_pdf_page_image(self, page_num):
-        """Render PDF page as image and return pygame surface."""
-        if page_num not in self.pdf_page_images and self.pdf_document:
+        """
+        Return a PDF page as a pygame surface in the display's pixel format.
+
+        Only called from the UI thread: pages rendered by the prefetch thread are
+        cached unconverted and converted here the first time they are shown.
+        """
+        entry = self._render_pdf_page(page_num)
+        if entry is None:
+            return None
+        surface, converted = entry
+        if not converted:
+            # convert() copies into the display format, so each frame's blit is a plain
+            # copy and the pixmap bytes the raw surface wraps can be released
+            surface = surface.convert()
+            with self._page_cache_lock:
+                if page_num in self.pdf_page_images:
+                    self.pdf_page_images[page_num] = (surface, True)
+        return surface
+
+    def _render_pdf_page(self, page_num):
+        """
+        Render a PDF page into the page cache, unless it is already there.
+
+        Also called from the prefetch thread, so the page cache and the PDF
+        document are each guarded by a lock.
+
+        Returns:
+            tuple: (surface, converted) cache entry, or None if rendering failed
+        """
+        with self._page_cache_lock:
+            entry = self.pdf_page_images.get(page_num)
+            if entry is not None:
+                self.pdf_page_images.move_to_end(page_num)
+                return entry
+
+        # PyMuPDF documents must not be used from two threads at once
+        with self._pdf_lock:
+            if not self.pdf_document:
+                return None
+
+            # The other thread may have rendered this page while we waited
+            with self._page_cache_lock:
+                entry = self.pdf_page_images.get(page_num)
+            if entry is not None:
+                return entry
+
             try:
                 page = self.pdf_document[page_num]
-                # Render page at appropriate resolution for 1280x720 screen
-                # Calculate zoom to fit page in content area
-                screen_width, screen_height = 1280, 720
-                content_width = screen_width - 2 * self.renderer.get_spacing('xl')
-                content_height = screen_height - 200  # Leave space for title and instructions
 
-                # Get page size
+                # Render at exactly the size the page is shown at: the largest zoom
+                # that fits the content area, so no pixels are rendered then cut off
                 page_rect = page.rect
-                page_width = page_rect.width
-                page_height = page_rect.height
-
-                # Calculate zoom to fit
-                zoom_x = content_width / page_width
-                zoom_y = content_height / page_height
-                zoom = min(zoom_x, zoom_y, 2.0)  # Max zoom of 2.0 to prevent too large images
+                zoom = min(self.content_rect.width / page_rect.width,
+                           self.content_rect.height / page_rect.height)
 
                 matrix = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=matrix)
-
-                # Convert to pygame surface
-                img_data = pix.tobytes("png")
-                from io import BytesIO
-                img_bytes = BytesIO(img_data)
-                import pygame.image
-                surface = pygame.image.load(img_bytes)
-                self.pdf_page_images[page_num] = surface
+                pix = page.get_pixmap(matrix=matrix, alpha=False)
+
+                # Wrap the raw RGB pixels directly rather than encoding and decoding a PNG.
+                # pix.samples is a copy the surface keeps alive, so the pixmap can be
+                # released straight away; conversion waits for the UI thread.
+                surface = pygame.image.frombuffer(pix.samples, (pix.width, pix.height), 'RGB')
+                pix = None
+                page = None
+
+                # MuPDF keeps display lists and pixmaps in its own store for reuse, which
+                # grows over a long session; empty it now and then
+                self._renders_since_shrink += 1
+                if self._renders_since_shrink >= STORE_SHRINK_INTERVAL:
+                    self._renders_since_shrink = 0
+                    fitz.TOOLS.store_shrink(100)
             except Exception as e:
                 print(f"Error rendering PDF page {page_num}: {e}")
                 return None
 
-        return self.pdf_page_images.get(page_num)
+        entry = (surface, False)
+        with self._page_cache_lock:
+            self.pdf_page_images[page_num] = entry
+            if len(self.pdf_page_images) > PDF_PAGE_CACHE_SIZE:
+                # Drop the only reference so SDL frees the pixels now
+                _, evicted = self.pdf_page_images.popitem(last=False)
+                del evicted
+        return entry
+
+    def _prefetch_adjacent_pages(self):
+        """Render the pages either side of the current one in the background."""
+        if not self.pdf_document:
+            return
+        for page_num in (self.current_page + 1, self.current_page - 1):
+            if 0 <= page_num < self.total_pages and page_num not in self.pdf_page_images:
+                self._prefetch_pool.submit(self._prefetch_page, page_num)
+
+    def _prefetch_page(self, page_num):
+        """Prefetch worker; skips pages the reader has already moved away from."""
+        if abs(page_num - self.current_page) <= 1:
+            self._render_pdf_page(page_num)
 
     def _get_current_page_text(self):
         """Get text content for current page."""
         if self.pdf_document:
             # For PDFs, we now render as images, but keep text fallback
             try:
-                page = self.pdf_document[self.current_page]
-                return page.get_text()
+                with self._pdf_lock:
+                    page = self.pdf_document[self.current_page]
+                    return page.get_text()
             except Exception as e:
                 return f"Error reading PDF page: {e}"
         else:
             # Text file
-            start_line = self.current_page * self.lines_per_page
-            end_line = min(start_line + self.lines_per_page, len(self.text_lines))
-            return '\n'.join(self.text_lines[start_line:end_line])
+            page = self.current_page
+            if not self.text_map or page >= len(self.page_starts):
+                return ""
+            start = self.page_starts[page]
+            # Stop before the newline that ends the page's last line
+            end = self.page_starts[page + 1] - 1 if page + 1 < len(self.page_starts) else len(self.text_map)
+            return self.text_map[start:end].decode('utf-8', errors='ignore')
 
     def update(self, dt: float):
         # Check video status
@@ -286,16 +468,12 @@ class ViewerState(BaseState):
         for event_type, key in events:
             if event_type == 'key_press':
                 if key == self.NAV_EXIT:
-                    # Clean up video process if running
+                    # Stop the video player if running, without waiting for it here
                     if self.video_process:
-                        try:
-                            self.video_process.terminate()
-                            self.video_process.wait(timeout=2)
-                        except:
-                            try:
-                                self.video_process.kill()
-                            except:
-                                pass
+                        self._stop_video_process()
+
+                    # Stop prefetching pages nobody will see and release the document
+                    self._close_pdf()
 
                     # Return to appropriate menu
                     if self.content_type == 'book':
@@ -313,13 +491,15 @@ class ViewerState(BaseState):
                     if key == self.NAV_NEXT_PAGE and self.current_page < self.total_pages - 1:
                         self.current_page += 1
                         self.scroll_offset = 0
+                        self._prefetch_adjacent_pages()
                     elif key == self.NAV_PREV_PAGE and self.current_page > 0:
                         self.current_page -= 1
                         self.scroll_offset = 0
+                        self._prefetch_adjacent_pages()
 
     def render(self, screen, ui_font):
-        # Clear screen with light grey background (2% grey shade)
-        screen.fill((230, 230, 230))
+        # Clear screen with light grey background
+        screen.fill(self.bg_color)
 
         # Render title
         self.title.render(screen)
@@ -344,34 +524,17 @@ class ViewerState(BaseState):
 
     def _render_book(self, screen):
         """Render book content."""
-        screen_width, screen_height = 1280, 720
+        screen_width = 1280
 
         # Content area
-        content_x = self.renderer.get_spacing('xl')
-        content_y = self.title.rect.bottom + self.renderer.get_spacing('lg')
-        content_width = screen_width - 2 * content_x
-        content_height = screen_height - content_y - self.renderer.get_spacing('3xl')
+        content_x, content_y, content_width, content_height = self.content_rect
 
-        if self.pdf_document and HAS_FITZ:
+        if self.pdf_document:
             # Render PDF as image
             page_image = self._get_pdf_page_image(self.current_page)
             if page_image:
-                # Center the image in the content area
-                img_rect = page_image.get_rect()
-                img_rect.centerx = screen_width // 2
-                img_rect.centery = content_y + content_height // 2
-
-                # Ensure image doesn't go outside content bounds
-                if img_rect.left < content_x:
-                    img_rect.left = content_x
-                if img_rect.right > screen_width - content_x:
-                    img_rect.right = screen_width - content_x
-                if img_rect.top < content_y:
-                    img_rect.top = content_y
-                if img_rect.bottom > content_y + content_height:
-                    img_rect.bottom = content_y + content_height
-
-                screen.blit(page_image, img_rect)
+                # Center the image in the content area; it was rendered to fit
+                screen.blit(page_image, page_image.get_rect(center=self.content_rect.center))
             else:
                 # Fallback to text rendering if image fails
                 self._render_book_text(screen, content_x, content_y, content_width, content_height)
@@ -380,54 +543,97 @@ class ViewerState(BaseState):
             self._render_book_text(screen, content_x, content_y, content_width, content_height)
 
         # Render page info
-        page_info = f"Page {self.current_page + 1} of {self.total_pages}"
-        page_text_component = Text(self.renderer, 0, screen_height - self.renderer.get_spacing('2xl'),
-                                 page_info, 'sm', 'text_muted', 'center')
-        page_text_component.rect.centerx = screen_width // 2
-        page_text_component.render(screen)
+        if self._page_info_page != self.current_page:
+            self._page_info_page = self.current_page
+            self.page_info_text.set_text(f"Page {self.current_page + 1} of {self.total_pages}")
+            self.page_info_text.rect.centerx = screen_width // 2
+        self.page_info_text.render(screen)
 
         # Render instructions
         self.book_instructions.render(screen)
 
-    def _render_book_text(self, screen, content_x, content_y, content_width, content_height):
-        """Render book as text (fallback for PDFs or text files)."""
-        screen_width, screen_height = 1280, 720
+    def _get_wrapped_lines(self, font, content_width):
+        """
+        Get the current page's text wrapped to the content width.
+
+        The result is kept until the page or width changes, so redrawing the
+        same page doesn't extract and wrap its text again.
+
+        Returns:
+            list: Lines of text that each fit within content_width
+        """
+        key = (self.current_page, content_width)
+        if self._wrapped_key == key:
+            return self._wrapped_lines
 
         # Get current page text
         page_text = self._get_current_page_text()
 
-        # Render page text
-        font = self.renderer.get_font('base')
-        line_height = font.get_linesize()
-        max_lines = content_height // line_height
-
-        # Split text into lines that fit
-        words = page_text.split()
+        # Split text into lines that fit, measuring each word once and adding up
+        # widths rather than re-measuring the whole line for every word
+        space_width = font.size(' ')[0]
         lines = []
-        current_line = ""
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            if font.size(test_line)[0] <= content_width:
-                current_line = test_line
+        current_words = []
+        current_width = 0
+        for word in page_text.split():
+            word_width = font.size(word)[0]
+            if current_words and current_width + space_width + word_width > content_width:
+                lines.append(' '.join(current_words))
+                current_words = [word]
+                current_width = word_width
+            elif current_words:
+                current_words.append(word)
+                current_width += space_width + word_width
             else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
+                current_words = [word]
+                current_width = word_width
+        if current_words:
+            lines.append(' '.join(current_words))
 
-        # Render visible lines
-        start_line = self.scroll_offset
-        end_line = min(start_line + max_lines, len(lines))
+        self._wrapped_key = key
+        self._wrapped_lines = lines
+        return lines
 
-        for i in range(start_line, end_line):
-            line_idx = i - start_line
-            line_y = content_y + line_idx * line_height
-            if line_y + line_height > screen_height - self.renderer.get_spacing('xl'):
-                break
+    def _render_book_text(self, screen, content_x, content_y, content_width, content_height):
+        """Render book as text (fallback for PDFs or text files)."""
+        key = (self.current_page, self.scroll_offset, content_width, content_height)
+        if self._text_page_key != key:
+            self._text_page_surface = self._build_text_page(content_width, content_height)
+            self._text_page_key = key
 
-            line_surface = font.render(lines[i], True, self.renderer.get_color('text_primary'))
-            screen.blit(line_surface, (content_x, line_y))
+        # The visible lines were composed into one surface, so a frame is one blit
+        screen.blit(self._text_page_surface, (content_x, content_y))
+
+    def _build_text_page(self, content_width, content_height):
+        """Draw the visible lines of the current page onto a surface the size of the content area."""
+        font = self.renderer.get_font('base')
+        line_height = font.get_linesize()
+        max_lines = content_height // line_height
+        lines = self._get_wrapped_lines(font, content_width)
+
+        surface = pygame.Surface((content_width, content_height)).convert()
+        surface.fill(self.bg_color)
+        visible_lines = lines[self.scroll_offset:self.scroll_offset + max_lines]
+        self.renderer.blit_batch(surface, [
+            (self._get_line_surface(font, line), (0, line_idx * line_height))
+            for line_idx, line in enumerate(visible_lines)
+        ])
+        return surface
+
+    def _get_line_surface(self, font, line):
+        """Render a line of book text, reusing the surface from earlier frames."""
+        surface = self._line_surfaces.get(line)
+        if surface is not None:
+            self._line_surfaces.move_to_end(line)
+            return surface
+
+        # Rendered onto the background colour and converted to the display format,
+        # so each blit is a plain copy rather than a per-pixel alpha blend
+        surface = font.render(line, True, self.renderer.get_color('text_primary'), self.bg_color).convert()
+        self._line_surfaces[line] = surface
+        if len(self._line_surfaces) > LINE_SURFACE_CACHE_SIZE:
+            self._line_surfaces.popitem(last=False)
+        return surface
 
     def _delete_current_content(self):
         """Delete the currently viewed content file and mark as deleted."""
@@ -439,7 +645,6 @@ class ViewerState(BaseState):
             self._cleanup_resources()
 
             # Small delay to ensure resources are fully released
-            import time
             time.sleep(1.0)  # Even longer delay
 
             # Try Windows-specific forceful deletion
@@ -471,7 +676,7 @@ class ViewerState(BaseState):
                             pass
 
             # Mark as deleted in tracker regardless of file deletion success
-            tracker = DeletedContentTracker()
+            tracker = get_tracker()
             tracker_type = 'book' if self.content_type == 'book' else 'video'
             tracker.mark_as_deleted(tracker_type, self.content_name)
 
@@ -493,34 +698,43 @@ class ViewerState(BaseState):
             self.error_message = f"Error deleting content: {str(e)}"
             print(f"Error deleting content: {e}")
 
-    def _cleanup_resources(self):
-        """Clean up all resources that might be holding the file open."""
-        try:
-            # Clean up PDF document first
+    def _close_pdf(self):
+        """Close the PDF document, once any page prefetch has finished with it."""
+        if self._prefetch_pool:
+            self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        with self._pdf_lock:
             if self.pdf_document:
                 self.pdf_document.close()
                 self.pdf_document = None
+                # Free everything MuPDF cached for the document
+                fitz.TOOLS.store_shrink(100)
                 print("Closed PDF document")
 
+    def _cleanup_resources(self):
+        """Clean up all resources that might be holding the file open."""
+        try:
+            # Clean up PDF document first
+            self._close_pdf()
+
             # Clear PDF page cache and delete surfaces
-            for surface in self.pdf_page_images.values():
-                if surface:
-                    del surface
-            self.pdf_page_images.clear()
+            with self._page_cache_lock:
+                for surface in self.pdf_page_images.values():
+                    if surface:
+                        del surface
+                self.pdf_page_images.clear()
 
             # Force garbage collection to release any remaining references
-            import gc
             gc.collect()
 
             # Clean up video process if running
             if self.video_process:
                 try:
-                    self.video_process.terminate()
+                    self._signal_video_process(self.video_process)
                     self.video_process.wait(timeout=2)
                     print("Terminated video process")
                 except:
                     try:
-                        self.video_process.kill()
+                        self._signal_video_process(self.video_process, force=True)
                         print("Killed video process")
                     except:
                         pass
@@ -532,12 +746,18 @@ class ViewerState(BaseState):
                 self.video_thread.join(timeout=1.0)
                 print("Video thread cleaned up")
 
-            # Clear text content
-            self.text_content = []
-            self.text_lines = []
+            # Unmap the text file so it can be deleted
+            if isinstance(self.text_map, mmap.mmap):
+                self.text_map.close()
+            self.text_map = None
+            self.page_starts = []
+            self._wrapped_key = None
+            self._wrapped_lines = []
+            self._line_surfaces.clear()
+            self._text_page_key = None
+            self._text_page_surface = None
 
             # Additional delay and garbage collection
-            import time
             time.sleep(0.2)
             gc.collect()
 
@@ -21,6 +21,10 @@ class UIComponent:
         """Check if point is within component bounds."""
         return self.rect.collidepoint(point)
 
+    def is_on_screen(self, screen) -> bool:
+        """Check if any part of the component lies within the screen's clip area."""
+        return self.rect.colliderect(screen.get_clip())
+
     def render(self, screen):
         """Render the component. Override in subclasses."""
         pass
@@ -43,17 +47,15 @@ class Card(UIComponent):
         self.has_shadow = has_shadow
 
     def render(self, screen):
-        if not self.visible:
+        if not self.visible or not self.is_on_screen(screen):
             return
 
         if self.has_shadow:
             self.renderer.draw_shadow(screen, self.rect)
 
-        # Draw background
-        self.renderer.draw_rect(screen, self.background_color, self.rect, self.border_radius)
-
-        # Draw border
-        self.renderer.draw_border(screen, self.rect, self.border_color, border_radius=self.border_radius)
+        # Draw background and border
+        self.renderer.draw_panel(screen, self.rect, self.background_color, self.border_color,
+                                 border_radius=self.border_radius)
 
 
 class Button(UIComponent):
@@ -87,7 +89,7 @@ class Button(UIComponent):
                 self.on_click()
 
     def render(self, screen):
-        if not self.visible:
+        if not self.visible or not self.is_on_screen(screen):
             return
 
         # Draw background
@@ -106,11 +108,10 @@ class Text(UIComponent):
     def __init__(self, renderer, x: int, y: int, text: str,
                  font_size: str = 'base', color: str = 'text_primary',
                  align: str = 'left', max_width: Optional[int] = None):
-        # Calculate initial size based on text
+        # Calculate initial size based on text; font.size measures without rasterizing
         font = renderer.get_font(font_size)
-        text_surface = font.render(text, True, (0, 0, 0))
-        width = max_width if max_width else text_surface.get_width()
-        height = text_surface.get_height()
+        text_width, height = font.size(text)
+        width = max_width if max_width else text_width
 
         super().__init__(renderer, x, y, width, height)
         self.text = text
@@ -118,22 +119,26 @@ class Text(UIComponent):
         self.color = color
         self.align = align
         self.max_width = max_width
+        self._surface = None  # Rendered text, reused until the text changes
 
     def set_text(self, text: str):
         """Update the text content."""
+        if text == self.text:
+            return
         self.text = text
+        self._surface = None
         # Recalculate size if needed
         if not self.max_width:
             font = self.renderer.get_font(self.font_size)
-            text_surface = font.render(text, True, (0, 0, 0))
-            self.rect.width = text_surface.get_width()
+            self.rect.width = font.size(text)[0]
 
     def render(self, screen):
         if not self.visible:
             return
 
-        self.renderer.draw_text(screen, self.text, (self.rect.x, self.rect.centery),
-                               self.font_size, self.color, self.align)
+        if self._surface is None:
+            self._surface = self.renderer.render_text(self.text, self.font_size, self.color)
+        self.renderer.blit_text(screen, self._surface, (self.rect.x, self.rect.centery), self.align)
 
 
 class ListItem(UIComponent):
@@ -145,31 +150,39 @@ class ListItem(UIComponent):
         self.text = text
         self.selected = selected
         self.padding = renderer.get_spacing('md')
+        self._surfaces = {}  # Rendered text per selection state
+
+    def set_text(self, text: str):
+        """Update the text content."""
+        if text == self.text:
+            return
+        self.text = text
+        self._surfaces.clear()
 
     def set_selected(self, selected: bool):
         """Set selection state."""
         self.selected = selected
 
     def render(self, screen):
-        if not self.visible:
+        if not self.visible or not self.is_on_screen(screen):
             return
 
         # Background color based on selection
         bg_color = 'primary' if self.selected else 'surface'
         text_color = 'background' if self.selected else 'text_primary'
 
-        # Draw background
-        self.renderer.draw_rect(screen, bg_color, self.rect, 'md')
-
-        # Draw border if selected
-        if self.selected:
-            self.renderer.draw_border(screen, self.rect, 'border_focus', border_radius='md')
+        # Draw background, with a border if selected
+        border_color = 'border_focus' if self.selected else None
+        self.renderer.draw_panel(screen, self.rect, bg_color, border_color, border_radius='md')
 
         # Draw text with padding
+        surface = self._surfaces.get(self.selected)
+        if surface is None:
+            surface = self.renderer.render_text(self.text, 'base', text_color)
+            self._surfaces[self.selected] = surface
         text_x = self.rect.x + self.padding
         text_y = self.rect.centery
-        self.renderer.draw_text(screen, self.text, (text_x, text_y),
-                               'base', text_color, 'left')
+        self.renderer.blit_text(screen, surface, (text_x, text_y), 'left')
 
 
 class Scrollbar(UIComponent):
@@ -183,6 +196,8 @@ class Scrollbar(UIComponent):
         self.current_scroll = current_scroll
         self.thumb_height = max(20, (visible_items / max(total_items, 1)) * height)
         self.thumb_y = y + (current_scroll / max(total_items - visible_items, 1)) * (height - self.thumb_height)
+        self.thumb_rect = self._make_thumb_rect()
+        self._last_state = None  # (scroll, total, visible) the thumb was last computed for
 
     def update_scroll(self, current_scroll: int, total_items: int = None, visible_items: int = None):
         """Update scroll position and optionally item counts."""
@@ -191,24 +206,32 @@ class Scrollbar(UIComponent):
         if visible_items is not None:
             self.visible_items = visible_items
 
+        state = (current_scroll, self.total_items, self.visible_items)
+        if state == self._last_state:
+            return
+        self._last_state = state
+
         self.current_scroll = max(0, min(current_scroll, max(self.total_items - self.visible_items, 0)))
         self.thumb_height = max(20, (self.visible_items / max(self.total_items, 1)) * self.rect.height)
         scrollable_range = max(self.total_items - self.visible_items, 1)
         self.thumb_y = self.rect.y + (self.current_scroll / scrollable_range) * (self.rect.height - self.thumb_height)
+        self.thumb_rect = self._make_thumb_rect()
+
+    def _make_thumb_rect(self) -> pygame.Rect:
+        """Build the thumb rectangle; only needed when the scroll state changes."""
+        return pygame.Rect(self.rect.x, int(self.thumb_y), self.rect.width, int(self.thumb_height))
 
     def render(self, screen):
-        if not self.visible or self.total_items <= self.visible_items:
+        if not self.visible or self.total_items <= self.visible_items or not self.is_on_screen(screen):
             return
 
         # Draw track
         track_color = 'border'
-        self.renderer.draw_rect(screen, track_color, self.rect, 'full')
+        self.renderer.draw_rect_rounded(screen, track_color, self.rect, 'full')
 
         # Draw thumb
-        thumb_rect = pygame.Rect(self.rect.x, int(self.thumb_y),
-                                self.rect.width, int(self.thumb_height))
         thumb_color = 'secondary'
-        self.renderer.draw_rect(screen, thumb_color, thumb_rect, 'full')
+        self.renderer.draw_rect_rounded(screen, thumb_color, self.thumb_rect, 'full')
 
 
 class ProgressBar(UIComponent):
@@ -228,7 +251,7 @@ class ProgressBar(UIComponent):
         self.progress = max(0.0, min(1.0, progress))
 
     def render(self, screen):
-        if not self.visible:
+        if not self.visible or not self.is_on_screen(screen):
             return
 
         # Draw background
@@ -249,6 +272,12 @@ class DownloadProgress(UIComponent):
         super().__init__(renderer, x, y, width, height)
         self.filename = filename
         self.progress = progress
+        self._label = self._make_label(filename)
+        self._percent_text = f"{int(progress * 100)}%"
+        # (text, surface) pairs rendered lazily on the UI thread, and again only when the
+        # text changes. update_progress runs on a download thread and never touches them.
+        self._label_surface = None
+        self._percent_surface = None
         self.bar_height = 8
         self.padding = renderer.get_spacing('sm')
 
@@ -258,28 +287,46 @@ class DownloadProgress(UIComponent):
                                        width - 2 * self.padding, self.bar_height,
                                        progress, 'border', 'accent', 'sm')
 
+    @staticmethod
+    def _make_label(filename: str) -> str:
+        """Build the 'Downloading: ...' label, truncating long filenames."""
+        if not filename:
+            return ""
+        display_name = filename[:40] + '...' if len(filename) > 40 else filename
+        return f"Downloading: {display_name}"
+
     def update_progress(self, filename: str, progress: float):
         """Update download progress."""
-        self.filename = filename
+        if filename != self.filename:
+            self.filename = filename
+            self._label = self._make_label(filename)
         self.progress = progress
+        self._percent_text = f"{int(progress * 100)}%"
         self.progress_bar.set_progress(progress)
 
     def render(self, screen):
-        if not self.visible:
+        if not self.visible or not self.is_on_screen(screen):
             return
 
-        # Draw filename text
-        if self.filename:
-            display_name = self.filename[:40] + '...' if len(self.filename) > 40 else self.filename
-            text_rect = self.renderer.draw_text(screen, f"Downloading: {display_name}",
-                                               (self.rect.x + self.padding, self.rect.y + self.padding),
-                                               'sm', 'text_primary', 'left')
+        # Draw filename text. Each attribute is read once, as update_progress may
+        # replace the text from the download thread at any time.
+        label = self._label
+        if label:
+            rendered = self._label_surface
+            if rendered is None or rendered[0] != label:
+                rendered = self._label_surface = (label, self.renderer.render_text(label, 'sm',
+                                                                                   'text_primary'))
+            self.renderer.blit_text(screen, rendered[1],
+                                    (self.rect.x + self.padding, self.rect.y + self.padding), 'left')
 
         # Draw progress bar
         self.progress_bar.render(screen)
 
-        # Draw progress percentage
-        percent_text = f"{int(self.progress * 100)}%"
-        self.renderer.draw_text(screen, percent_text,
-                               (self.rect.right - self.padding, self.rect.y + self.padding),
-                               'sm', 'text_secondary', 'right')
+        # Draw progress percentage; kept out of the shared text cache, as it changes constantly
+        percent_text = self._percent_text
+        rendered = self._percent_surface
+        if rendered is None or rendered[0] != percent_text:
+            rendered = self._percent_surface = (percent_text, self.renderer.render_text(
+                percent_text, 'sm', 'text_secondary', cache=False))
+        self.renderer.blit_text(screen, rendered[1],
+                                (self.rect.right - self.padding, self.rect.y + self.padding), 'right')
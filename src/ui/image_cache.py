@@ -0,0 +1,37 @@
+"""
+MEB-x Image Cache
+
+Loads image assets once per process and shares the converted surfaces between states.
+"""
+
+import pygame
+
+# (path, alpha, scale) -> surface converted to the display format
+_cache = {}
+
+
+def load_image(path: str, alpha: bool = True, scale: tuple = None):
+    """
+    Load an image, reusing the surface from an earlier load of the same file.
+
+    The display mode must be set before the first call, since the surface is
+    converted to the display's pixel format.
+
+    Args:
+        path: Path to the image file
+        alpha: Keep per-pixel alpha (convert_alpha) rather than convert
+        scale: Optional (width, height) to smoothscale to; the scaled surface is cached too
+
+    Returns:
+        pygame.Surface: The cached surface; callers must not draw on it
+    """
+    key = (path, alpha, scale)
+    surface = _cache.get(key)
+    if surface is None:
+        if scale is None:
+            surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        else:
+            surface = pygame.transform.smoothscale(load_image(path, alpha), scale)
+        _cache[key] = surface
+    return surface
@@ -4,13 +4,61 @@ MEB-x UI Renderer
 Handles all Pygame drawing calls and provides utilities for consistent UI rendering.
 """
 
+import os
 import pygame
 import math
+import functools
+from collections import OrderedDict
+
+# Rendered text surfaces kept per renderer; least recently used are dropped first
+TEXT_CACHE_SIZE = 512
+
+# Shadow surfaces kept per renderer, one per (width, height, blur, opacity)
+SHADOW_CACHE_SIZE = 32
+
+# Color used for names missing from the palette
+DEFAULT_COLOR = (0, 0, 0)
+DEFAULT_PG_COLOR = pygame.Color(*DEFAULT_COLOR)
+
+# Bound once so the draw helpers skip the pygame.draw attribute lookups
+_draw_rect = pygame.draw.rect
+
+
+@functools.lru_cache(maxsize=256)
+def _hex_to_rgb(hex_color: str) -> tuple:
+    """
+    Parse '#rrggbb' or 'rrggbb' with one int() call; cached, as themes repeat colors.
+
+    The alpha of '#rrggbbaa' is ignored.
+
+    Raises:
+        ValueError: If the value is not 6 or 8 hex digits
+    """
+    digits = hex_color.lstrip('#')
+    if len(digits) not in (6, 8):
+        raise ValueError(f"Invalid hex color: {hex_color!r}")
+    value = int(digits[:6], 16)
+    return (value >> 16 & 0xff, value >> 8 & 0xff, value & 0xff)
 
 
 class UIRenderer:
     """Handles UI rendering utilities and constants."""
 
+    # Fixed attribute layout: no per-instance __dict__, and attribute reads on
+    # the draw path go straight to their slot
+    __slots__ = ('colors', 'font_sizes', 'spacing', 'border_radius', 'fonts',
+                 '_pg_colors', '_text_cache', '_shadow_cache')
+
+    _default = None
+
+    @classmethod
+    def get_default(cls):
+        """Get the shared renderer with the default font loaded, creating it on first use."""
+        if cls._default is None:
+            cls._default = cls()
+            cls._default.load_fonts(os.path.join('assets', 'fonts', 'default.ttf'))
+        return cls._default
+
     def __init__(self):
         # Color palette (RGB tuples)
         self.colors = {
@@ -68,62 +116,163 @@ class UIRenderer:
         # Initialize fonts (will be set by load_fonts)
         self.fonts = {}
 
+        # (text, font_size, color_name) -> rendered surface
+        self._text_cache = OrderedDict()
+
+        # (width, height, blur, opacity) -> shadow surface
+        self._shadow_cache = OrderedDict()
+
+        # The palette as pygame.Color objects, passed to pygame's draw and render calls
+        self._build_pg_colors()
+
     def load_fonts(self, font_path: str):
         """Load fonts at different sizes."""
+        self.invalidate_text_cache()
+        fallback_path = None
+        fallback_resolved = False
         for name, size in self.font_sizes.items():
             try:
                 self.fonts[name] = pygame.font.Font(font_path, size)
             except Exception as e:
                 print(f"Error loading font {name} ({size}px): {e}")
-                # Fallback to default font
-                self.fonts[name] = pygame.font.SysFont('arial', size)
+                # Fallback to default font, looking up the system font file only once
+                if not fallback_resolved:
+                    fallback_path = pygame.font.match_font('arial')
+                    fallback_resolved = True
+                self.fonts[name] = pygame.font.Font(fallback_path, size)
+
+    def _build_pg_colors(self):
+        """Convert the palette to pygame.Color once, rather than a tuple on every draw call."""
+        self._pg_colors = {name: pygame.Color(*rgb) for name, rgb in self.colors.items()}
 
     def get_color(self, name: str) -> tuple:
         """Get RGB color tuple by name."""
-        return self.colors.get(name, (0, 0, 0))
+        return self.colors.get(name, DEFAULT_COLOR)
 
     def get_font(self, size: str = 'base'):
         """Get font by size name."""
-        return self.fonts.get(size, self.fonts.get('base', pygame.font.SysFont('arial', 16)))
+        font = self.fonts.get(size) or self.fonts.get('base')
+        if font is None:
+            # Fonts not loaded yet; create the fallback once rather than on every call
+            font = self.fonts['base'] = pygame.font.SysFont('arial', 16)
+        return font
 
     def get_spacing(self, size: str = 'md') -> int:
         """Get spacing value by name."""
         return self.spacing.get(size, 16)
 
+    def create_layer(self, size: tuple, color_name: str = 'background'):
+        """
+        Create an opaque surface to draw static UI onto once.
+
+        All draw_* methods accept it in place of the screen; blitting the finished
+        layer each frame then replaces the individual draw calls.
+
+        Args:
+            size: (width, height) of the layer
+            color_name: Palette color the layer is filled with
+
+        Returns:
+            pygame.Surface: The filled layer, in the display's pixel format
+        """
+        layer = pygame.Surface(size).convert()
+        layer.fill(self.colors.get(color_name, DEFAULT_COLOR))
+        return layer
+
     def draw_rect(self, screen, color_name: str, rect: pygame.Rect, border_radius: str = 'none'):
-        """Draw a rounded rectangle."""
-        color = self.get_color(color_name)
-        radius = self.border_radius.get(border_radius, 0)
+        """Draw a filled rectangle; returns the area drawn."""
+        if border_radius != 'none':
+            return self.draw_rect_rounded(screen, color_name, rect, border_radius)
+        return _draw_rect(screen, self._pg_colors.get(color_name, DEFAULT_PG_COLOR), rect)
 
+    def draw_rect_rounded(self, screen, color_name: str, rect: pygame.Rect, radius_name: str):
+        """Draw a filled rectangle with rounded corners; returns the area drawn."""
+        color = self._pg_colors.get(color_name, DEFAULT_PG_COLOR)
+        radius = self.border_radius.get(radius_name, 0)
         if radius > 0:
-            # Draw rounded rectangle
-            pygame.draw.rect(screen, color, rect, border_radius=radius)
-        else:
-            pygame.draw.rect(screen, color, rect)
+            return _draw_rect(screen, color, rect, border_radius=radius)
+        return _draw_rect(screen, color, rect)
 
     def draw_border(self, screen, rect: pygame.Rect, color_name: str = 'border',
                    width: int = 1, border_radius: str = 'none'):
-        """Draw a border around a rectangle."""
-        color = self.get_color(color_name)
-        radius = self.border_radius.get(border_radius, 0)
+        """Draw a border around a rectangle; returns the area drawn."""
+        color = self._pg_colors.get(color_name, DEFAULT_PG_COLOR)
+        radius = 0 if border_radius == 'none' else self.border_radius.get(border_radius, 0)
 
         # Create a slightly larger rect for the border
         border_rect = rect.inflate(width * 2, width * 2)
-        inner_rect = rect
 
         if radius > 0:
-            pygame.draw.rect(screen, color, border_rect, width, border_radius=radius)
+            return _draw_rect(screen, color, border_rect, width, border_radius=radius)
         else:
-            pygame.draw.rect(screen, color, border_rect, width)
+            return _draw_rect(screen, color, border_rect, width)
+
+    def draw_panel(self, screen, rect: pygame.Rect, fill_color: str, border_color: str = None,
+                   border_width: int = 1, border_radius: str = 'none'):
+        """
+        Draw a filled rectangle with an optional border, resolving its style once.
+
+        Equivalent to draw_rect followed by draw_border with the same radius.
+
+        Returns:
+            pygame.Rect: The area drawn
+        """
+        radius = 0 if border_radius == 'none' else self.border_radius.get(border_radius, 0)
+        fill = self._pg_colors.get(fill_color, DEFAULT_PG_COLOR)
+        if radius > 0:
+            dirty = _draw_rect(screen, fill, rect, border_radius=radius)
+        else:
+            dirty = _draw_rect(screen, fill, rect)
+
+        if border_color is not None:
+            color = self._pg_colors.get(border_color, DEFAULT_PG_COLOR)
+            border_rect = rect.inflate(border_width * 2, border_width * 2)
+            if radius > 0:
+                dirty = _draw_rect(screen, color, border_rect, border_width, border_radius=radius)
+            else:
+                dirty = _draw_rect(screen, color, border_rect, border_width)
+        return dirty
+
+    def render_text(self, text: str, font_size: str = 'base', color_name: str = 'text_primary',
+                    cache: bool = True):
+        """
+        Rasterize text into a surface that can be blitted repeatedly.
+
+        Args:
+            text: The text to render
+            font_size: Font size name
+            color_name: Palette color name
+            cache: Keep the surface in the shared text cache; pass False for
+                short-lived text (counters, percentages) the caller holds on to
+                itself, so it does not push stable labels out of the cache
+
+        Returns:
+            pygame.Surface: The rendered text
+        """
+        key = (text, font_size, color_name)
+        if cache:
+            text_surface = self._text_cache.get(key)
+            if text_surface is not None:
+                self._text_cache.move_to_end(key)
+                return text_surface
 
-    def draw_text(self, screen, text: str, position: tuple, font_size: str = 'base',
-                 color_name: str = 'text_primary', align: str = 'left'):
-        """Draw text with specified styling."""
         font = self.get_font(font_size)
-        color = self.get_color(color_name)
+        color = self._pg_colors.get(color_name, DEFAULT_PG_COLOR)
+        # Converted once, as it is blitted many times; the display is set up before
+        # any state renders text
+        text_surface = font.render(text, True, color).convert_alpha()
+        if cache:
+            self._text_cache[key] = text_surface
+            if len(self._text_cache) > TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        return text_surface
 
-        text_surface = font.render(text, True, color)
+    def invalidate_text_cache(self):
+        """Drop all cached text surfaces, e.g. after fonts or colors change."""
+        self._text_cache.clear()
 
+    def blit_text(self, screen, text_surface, position: tuple, align: str = 'left'):
+        """Blit a pre-rendered text surface, aligned like draw_text."""
         if align == 'center':
             x = position[0] - text_surface.get_width() // 2
             y = position[1] - text_surface.get_height() // 2
@@ -138,22 +287,63 @@ class UIRenderer:
 
         return text_surface.get_rect(topleft=(x, y))
 
+    @staticmethod
+    def blit_batch(target, blits: list):
+        """
+        Blit many (surface, position) pairs with one call instead of a Python loop.
+
+        Uses Surface.fblits on pygame-ce and Surface.blits otherwise.
+        """
+        if hasattr(target, 'fblits'):
+            target.fblits(blits)
+        else:
+            target.blits(blits, doreturn=False)
+
+    def draw_text(self, screen, text: str, position: tuple, font_size: str = 'base',
+                 color_name: str = 'text_primary', align: str = 'left'):
+        """Draw text with specified styling."""
+        text_surface = self.render_text(text, font_size, color_name)
+        return self.blit_text(screen, text_surface, position, align)
+
     def draw_shadow(self, screen, rect: pygame.Rect, blur: int = 4, opacity: int = 30):
-        """Draw a simple shadow effect."""
-        shadow_color = (0, 0, 0, opacity)
-        shadow_surface = pygame.Surface((rect.width + blur * 2, rect.height + blur * 2), pygame.SRCALPHA)
-        shadow_rect = pygame.Rect(blur, blur, rect.width, rect.height)
+        """Draw a simple shadow effect; returns the area drawn."""
+        key = (rect.width, rect.height, blur, opacity)
+        shadow_surface = self._shadow_cache.get(key)
+        if shadow_surface is not None:
+            self._shadow_cache.move_to_end(key)
+        else:
+            shadow_color = (0, 0, 0, opacity)
+            shadow_surface = pygame.Surface((rect.width + blur * 2, rect.height + blur * 2), pygame.SRCALPHA)
+            shadow_rect = pygame.Rect(blur, blur, rect.width, rect.height)
+
+            pygame.draw.rect(shadow_surface, shadow_color, shadow_rect, border_radius=8)
+
+            # Soften the edges over the blur margin. This runs once per cached shadow,
+            # so its cost never reaches the per-frame path.
+            if blur > 0:
+                if hasattr(pygame.transform, 'box_blur'):  # pygame-ce
+                    shadow_surface = pygame.transform.box_blur(shadow_surface, blur)
+                else:
+                    # Scaling down and back up with filtering averages each pixel
+                    # over roughly a blur-sized box
+                    size = shadow_surface.get_size()
+                    small = (max(1, size[0] // blur), max(1, size[1] // blur))
+                    shadow_surface = pygame.transform.smoothscale(
+                        pygame.transform.smoothscale(shadow_surface, small), size)
 
-        # Simple shadow - could be enhanced with blur effect
-        pygame.draw.rect(shadow_surface, shadow_color, shadow_rect, border_radius=8)
+            # Same-sized widgets share one shadow, drawn and converted once
+            shadow_surface = shadow_surface.convert_alpha()
+            self._shadow_cache[key] = shadow_surface
+            if len(self._shadow_cache) > SHADOW_CACHE_SIZE:
+                self._shadow_cache.popitem(last=False)
 
-        screen.blit(shadow_surface, (rect.x - blur, rect.y - blur))
+        return screen.blit(shadow_surface, (rect.x - blur, rect.y - blur))
 
     def hex_to_rgb(self, hex_color: str) -> tuple:
         """Convert hex color string to RGB tuple."""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return _hex_to_rgb(hex_color)
 
     def rgb_to_hex(self, rgb: tuple) -> str:
         """Convert RGB tuple to hex color string."""
-        return '#{:02x}{:02x}{:02x}'.format(*rgb)
+        r, g, b = rgb
+        return '#%06x' % (r << 16 | g << 8 | b)